@@ -0,0 +1,9 @@
+# -*- coding:utf-8 -*-
+"""
+benchmarks of tinyschema.
+
+    $ python -m benchmarks -o before.json
+    $ python -m benchmarks -o after.json --baseline before.json
+
+see `python -m benchmarks --help`
+"""
@@ -0,0 +1,36 @@
+# -*- coding:utf-8 -*-
+import sys
+import argparse
+from .cases import cases
+from . import runner
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="benchmarks of tinyschema")
+    parser.add_argument("-o", "--output", help="store results as JSON")
+    parser.add_argument("--baseline", help="compare with results stored by --output")
+    parser.add_argument("--threshold", type=float, default=0.1, help="ratio treated as a change (default: 0.1)")
+    parser.add_argument("--scale", type=int, default=10, help="size of datasets (default: 10)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--list", action="store_true", help="list cases")
+    parser.add_argument("cases", nargs="*", help="prefixes of case names (default: all)")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name in cases:
+            print(name)
+        return 0
+
+    result = runner.run(cases, scale=args.scale, repeat=args.repeat, selected=args.cases)
+    if args.output:
+        runner.dump(result, args.output)
+    if args.baseline:
+        rows = runner.compare(runner.load(args.baseline), result, threshold=args.threshold)
+        runner.print_comparison(rows)
+        if any(row[-1] == "slower" for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
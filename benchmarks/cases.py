@@ -0,0 +1,215 @@
+# -*- coding:utf-8 -*-
+"""
+benchmark cases. a case is a function taking `scale` and returning a function without arguments, which is timed.
+datasets are prepared outside of the timed function.
+"""
+from collections import OrderedDict
+import tinyschema as t
+from tinyschema.datavalidation import ValidationObject, Invalid, multi, single, share, collection
+from . import datasets
+
+cases = OrderedDict()
+
+
+def case(name):
+    def wrapper(fn):
+        cases[name] = fn
+        return fn
+    return wrapper
+
+
+class Point(t.Schema):
+    x = t.column(t.PositiveIntegerField)
+    y = t.column(t.PositiveIntegerField)
+    z = t.column(t.PositiveIntegerField, required=False)
+
+
+class Pair(t.Schema):
+    l = t.column(t.Container(Point))
+    r = t.column(t.Container(Point))
+
+
+class Plot(t.Schema):
+    ps = t.column(t.Collection(Point))
+
+
+class PointValidation(ValidationObject):
+    @multi(["x", "y"])
+    def ordered(self, x, y):
+        if x > y:
+            raise Invalid("x > y")
+
+    @share(single("x"), single("y"), single("z"))
+    def limit(self, value):
+        if value > 900:
+            raise Invalid("too large")
+
+
+class PlotValidation(ValidationObject):
+    @collection("ps")
+    class ps(object):
+        @multi(["x", "y"])
+        def ordered(self, x, y):
+            if x > y:
+                raise Invalid("x > y")
+
+
+@case("schema_creation.SchemaMeta")
+def schema_creation_meta(scale):
+    def run():
+        for _ in range(scale):
+            class Wide(t.Schema):
+                a = t.column(t.IntegerField)
+                b = t.column(t.FloatField)
+                c = t.column(t.TextField, t.OneOf(["x", "y"]))
+                d = t.column(t.BooleanField, required=False)
+                e = t.column(t.Container(Point))
+                f = t.column(t.Collection(Point))
+    return run
+
+
+@case("schema_creation.as_schema")
+def schema_creation_as_schema(scale):
+    def run():
+        for _ in range(scale):
+            attrs = {"f{}".format(i): t.column(t.IntegerField) for i in range(10)}
+            t.as_schema(type("Generated", (object, ), attrs))
+    return run
+
+
+@case("validate.flat")
+def validate_flat(scale):
+    rows = datasets.point_rows(scale * 10)
+
+    def run():
+        for row in rows:
+            Point.fromdict(dict(row)).validate()
+    return run
+
+
+@case("validate.container")
+def validate_container(scale):
+    rows = datasets.pair_rows(scale * 10)
+
+    def run():
+        for row in rows:
+            Pair.fromdict({"l": dict(row["l"]), "r": dict(row["r"])}).validate()
+    return run
+
+
+@case("validate.collection")
+def validate_collection(scale):
+    rows = datasets.plot_rows(scale, 20)
+
+    def run():
+        for row in rows:
+            Plot.fromdict({"ps": [dict(p) for p in row["ps"]]}).validate()
+    return run
+
+
+@case("validate_dict.flat")
+def validate_dict_flat(scale):
+    rows = datasets.point_rows(scale * 10)
+
+    def run():
+        Point.validate_many(rows)
+    return run
+
+
+@case("validate.failure_translated")
+def validate_failure_translated(scale):
+    rows = datasets.point_rows(scale * 10, invalid_ratio=1.0)
+
+    def run():
+        for row in rows:
+            try:
+                Point.fromdict(dict(row)).validate(locale="ja")
+            except t.Failure as e:
+                e.errors
+    return run
+
+
+@case("datavalidation.multi_share")
+def datavalidation_multi_share(scale):
+    rows = datasets.point_rows(scale * 10)
+    validate = PointValidation()
+
+    def run():
+        for row in rows:
+            try:
+                validate(Point.fromdict(dict(row)))
+            except t.Failure:
+                pass
+    return run
+
+
+@case("datavalidation.collection")
+def datavalidation_collection(scale):
+    rows = datasets.plot_rows(scale, 20)
+    validate = PlotValidation()
+
+    def run():
+        for row in rows:
+            try:
+                validate(Plot.fromdict({"ps": [dict(p) for p in row["ps"]]}))
+            except t.Failure:
+                pass
+    return run
+
+
+@case("parser.from_multidict")
+def parser_from_multidict(scale):
+    from tinyschema.parser import from_multidict
+    form = datasets.large_form(20, scale)
+
+    def run():
+        from_multidict(form)
+    return run
+
+
+def _mapper_family():
+    from tinyschema.construct import MapperFamily, Mapper, create_schema
+
+    class FieldParams(object):
+        description = t.column(t.TextField)
+        choices = t.column(t.ChoicesField)
+        required = t.column(t.BooleanField, default=False, required=False)
+
+    def create_field(name, schema, validated):
+        return t.column(t.Field,
+                        post=t.OneOf([x[0] for x in validated["choices"]]),
+                        name=name,
+                        label=validated["description"],
+                        choices=validated["choices"],
+                        widget=schema.__class__.__name__,
+                        required=validated["required"])
+
+    def iterator(params):
+        for sub_params in params:
+            yield sub_params["name"], sub_params["type"], sub_params["values"]
+
+    mf = MapperFamily(create_schema, iterator=iterator)
+    for name in ["select", "radio", "checkbox"]:
+        mf.add(name, Mapper(t.as_schema(type(name, (FieldParams, ), {})), create_field))
+    return mf
+
+
+@case("construct.MapperFamily")
+def construct_mapper_family(scale):
+    mf = _mapper_family()
+    params = datasets.dynamic_fields(scale)
+
+    def run():
+        mf("Generated", params)
+    return run
+
+
+@case("renderer.render_schema")
+def renderer_render_schema(scale):
+    from tinyschema.renderer import SchemaRenderer  # requires mako
+    schema = _mapper_family()("Generated", datasets.dynamic_fields(scale))
+    renderer = SchemaRenderer()
+
+    def run():
+        renderer.render_schema(schema())
+    return run
@@ -0,0 +1,72 @@
+# -*- coding:utf-8 -*-
+"""
+reproducible datasets. the same seed produces the same data, on any machine.
+"""
+import random
+
+SEED = 20150101
+
+
+def _rng(seed):
+    return random.Random(SEED if seed is None else seed)
+
+
+def point_rows(n, seed=None, invalid_ratio=0.0):
+    """rows for a Point-like schema (x, y, z are positive integers as strings)"""
+    rng = _rng(seed)
+    rows = []
+    for i in range(n):
+        row = {"x": str(rng.randint(0, 1000)), "y": str(rng.randint(0, 1000))}
+        if rng.random() < 0.5:
+            row["z"] = str(rng.randint(0, 1000))
+        if rng.random() < invalid_ratio:
+            row["x"] = rng.choice(["", "aa", "-1", None])
+        rows.append(row)
+    return rows
+
+
+def pair_rows(n, seed=None):
+    rows = point_rows(n * 2, seed=seed)
+    return [{"l": rows[2 * i], "r": rows[2 * i + 1]} for i in range(n)]
+
+
+def plot_rows(n, size, seed=None):
+    rows = point_rows(n * size, seed=seed)
+    return [{"ps": rows[i * size:(i + 1) * size]} for i in range(n)]
+
+
+class FormData(object):
+    """minimal multidict (like webob's MultiDict, `items()` includes all values)"""
+    def __init__(self, items):
+        self._items = items
+
+    def keys(self):
+        return [k for k, _ in self._items]
+
+    def items(self):
+        return iter(self._items)
+
+    def getall(self, k):
+        return [v for k_, v in self._items if k_ == k]
+
+
+def large_form(n_fields, n_rows, seed=None):
+    """form data with n_fields fields, repeated n_rows times (e.g. a table of inputs)"""
+    rng = _rng(seed)
+    items = []
+    for _ in range(n_rows):
+        for i in range(n_fields):
+            items.append(("field{}".format(i), str(rng.randint(0, 1000))))
+    return FormData(items)
+
+
+def dynamic_fields(n, seed=None):
+    """params of construct.MapperFamily, n fields of select/radio/checkbox"""
+    rng = _rng(seed)
+    choices = [[str(i), "choice{}".format(i)] for i in range(5)]
+    return [
+        {"name": "f{}".format(i),
+         "type": rng.choice(["select", "radio", "checkbox"]),
+         "values": {"required": rng.random() < 0.5, "choices": choices, "description": "field{}".format(i)}}
+        for i in range(n)
+    ]
@@ -0,0 +1,91 @@
+# -*- coding:utf-8 -*-
+"""
+running cases, storing results as JSON, and comparing results with a baseline.
+"""
+import logging
+logger = logging.getLogger(__name__)
+import sys
+import json
+import time
+import platform
+import statistics
+from timeit import Timer
+from collections import OrderedDict
+
+
+def _version():
+    try:
+        from importlib.metadata import version
+        return version("tinyschema")
+    except Exception:
+        return "unknown"
+
+
+def measure(factory, scale, repeat=5):
+    """seconds per call of the function created by factory(scale). the best and the median of `repeat` runs"""
+    timer = Timer(factory(scale))
+    number, _ = timer.autorange()
+    timings = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    return OrderedDict([
+        ("scale", scale),
+        ("number", number),
+        ("repeat", repeat),
+        ("best", min(timings)),
+        ("median", statistics.median(timings)),
+    ])
+
+
+def run(cases, scale=10, repeat=5, selected=None, out=sys.stderr):
+    results = OrderedDict()
+    for name, factory in cases.items():
+        if selected and not any(name.startswith(prefix) for prefix in selected):
+            continue
+        try:
+            results[name] = measure(factory, scale, repeat=repeat)
+        except ImportError as e:
+            out.write("{:<40} skipped ({})\n".format(name, e))
+            continue
+        out.write("{:<40} {:>12.3f} us\n".format(name, results[name]["best"] * 1e6))
+    return OrderedDict([
+        ("meta", OrderedDict([
+            ("tinyschema", _version()),
+            ("python", platform.python_version()),
+            ("implementation", platform.python_implementation()),
+            ("platform", platform.platform()),
+            ("created_at", time.strftime("%Y-%m-%dT%H:%M:%S")),
+        ])),
+        ("results", results),
+    ])
+
+
+def compare(baseline, current, threshold=0.1):
+    """list of (name, baseline_best, current_best, ratio, status). status is "slower", "faster" or "same" """
+    rows = []
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None or base["scale"] != result["scale"]:
+            continue
+        ratio = result["best"] / base["best"]
+        if ratio > 1 + threshold:
+            status = "slower"
+        elif ratio < 1 - threshold:
+            status = "faster"
+        else:
+            status = "same"
+        rows.append((name, base["best"], result["best"], ratio, status))
+    return rows
+
+
+def print_comparison(rows, out=sys.stdout):
+    for name, base, current, ratio, status in rows:
+        out.write("{:<40} {:>12.3f} us -> {:>12.3f} us  x{:.2f}  {}\n".format(name, base * 1e6, current * 1e6, ratio, status))
+
+
+def load(path):
+    with open(path) as rf:
+        return json.load(rf)
+
+
+def dump(result, path):
+    with open(path, "w") as wf:
+        json.dump(result, wf, indent=2)
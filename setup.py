@@ -27,6 +27,18 @@ tests_require =[
 testing_extras = tests_require + [
     ]
 
+json_extras = [
+    "orjson"
+]
+
+columnar_extras = [
+    "numpy"
+]
+
+regex_extras = [
+    "regex"
+]
+
 from setuptools.command.test import test as TestCommand
 
 class PyTest(TestCommand):
@@ -51,13 +63,16 @@ setup(name='tinyschema',
       author="",
       author_email="",
       url="https://github.com/podhmo/tinyschema",
-      packages=find_packages(),
+      packages=find_packages(exclude=["benchmarks", "benchmarks.*"]),
       include_package_data=True,
       zip_safe=False,
       install_requires = install_requires,
       extras_require = {
           'testing':testing_extras,
           'docs':docs_extras,
+          'columnar':columnar_extras,
+          'json':json_extras,
+          'regex':regex_extras,
           },
       tests_require = tests_require,
       cmdclass = {'test': PyTest},
@@ -1,32 +1,142 @@
 # -*- coding:utf-8 -*-
 import logging
 logger = logging.getLogger(__name__)
-import re
+import copy
+import sys
 from functools import partial
 from collections import (
     defaultdict,
     OrderedDict
 )
+from collections.abc import Mapping
 from .langhelpers import gensym
+from .choices import (
+    ChoiceIndex,
+    as_choice_index
+)
+from itertools import islice
+from .patterns import (
+    Prefilter,
+    compile_pattern,
+    compile_timeboxed,
+    match_timeboxed
+)
 from .compat import (
     text_,
-    string_types,
-    FileNotFoundError
+    text_type,
+    string_types
 )
+from types import MappingProxyType
+from functools import lru_cache
 import gettext
 import translationstring
+import os
 import os.path
 here = os.path.abspath(os.path.dirname(__file__))
-translation = None
 
 
-def create_translator(languages=None):
+def load_catalogs(directory):
+    """load all message catalogs under directory, once. {locale: GNUTranslations}"""
+    catalogs = {}
+    for locale in sorted(os.listdir(directory)):
+        path = os.path.join(directory, locale, "LC_MESSAGES", "tinyschema.mo")
+        if os.path.exists(path):
+            with open(path, "rb") as rf:
+                catalogs[locale] = gettext.GNUTranslations(rf)
+    return MappingProxyType(catalogs)
+
+catalogs = load_catalogs(os.path.join(here, "locales"))
+
+
+@lru_cache(maxsize=1024)
+def _template(msgid, default, locale):
+    catalog = catalogs.get(locale)
+    translated = msgid if catalog is None else catalog.gettext(msgid)
+    if translated == msgid:
+        translated = default
+    return translated
+
+
+def _render(msgid, default, mapping, locale):
+    translated = _template(msgid, default, locale)
+    if mapping and translated and "$" in translated:
+        translated = translationstring.TranslationString(msgid, mapping=mapping).interpolate(translated)
+    return translated
+
+
+@lru_cache(maxsize=4096)
+def _cached_render(msgid, default, mapping_items, locale):
+    return _render(msgid, default, {k: v for k, _, v in mapping_items}, locale)
+
+
+_MAX_CACHED_SIZE = 512  # bytes of a mapping value, larger values (e.g. a huge invalid input) are not cached
+
+
+def render_message(tstring, locale=None):
+    """translate and interpolate a translation string. translated templates are cached by (msgid, locale),
+    rendered messages are cached by (msgid, mapping, locale) when values of mapping are small
+    """
+    if not isinstance(tstring, translationstring.TranslationString):
+        return tstring
+    mapping = tstring.mapping
+    if mapping and any(sys.getsizeof(v) > _MAX_CACHED_SIZE for v in mapping.values()):
+        return _render(text_type(tstring), tstring.default, mapping, locale)
     try:
-        translation = gettext.translation("tinyschema", os.path.join(here, "locales"), languages=languages, codeset="utf8")
-    except FileNotFoundError:
-        logger.warn("languages %s is not found", languages)
-        translation = None
-    return translationstring.Translator(translation)
+        # type is a part of the key, 1, 1.0 and True are equal but rendered differently
+        items = tuple((k, type(v), v) for k, v in sorted(mapping.items())) if mapping else ()
+        hash(items)
+    except TypeError:  # unhashable value in mapping
+        return _render(text_type(tstring), tstring.default, mapping, locale)
+    return _cached_render(text_type(tstring), tstring.default, items, locale)
+
+
+class Translator(object):
+    """translator for a locale, safe to share between threads"""
+    def __init__(self, locale=None):
+        self.locale = locale
+
+    def __call__(self, tstring):
+        return render_message(tstring, self.locale)
+
+    def __repr__(self):
+        return "<Translator locale={!r}>".format(self.locale)
+
+
+def _expand_language(lang):
+    lang = lang.split(".")[0].split("@")[0]
+    if "_" in lang:
+        return [lang, lang.split("_")[0]]
+    return [lang]
+
+
+def _languages_from_environ():
+    for envar in ("LANGUAGE", "LC_ALL", "LC_MESSAGES", "LANG"):
+        val = os.environ.get(envar)
+        if val:
+            return val.split(":")
+    return []
+
+
+def find_locale(languages=None):
+    """the first locale having a catalog, in languages (default: environment variables, like gettext)"""
+    for lang in (languages or _languages_from_environ()):
+        for candidate in _expand_language(lang):
+            if candidate in catalogs:
+                return candidate
+    if languages:
+        logger.warning("languages %s is not found", languages)
+    return None
+
+
+def create_translator(languages=None):
+    return Translator(find_locale(languages))
+
+
+def translator_for(locale=None):
+    """translator of the locale. if locale is None, the default translator (see `set_translator`) is returned"""
+    if locale is None:
+        return translator
+    return Translator(locale)
 
 
 def set_translator(languages=None):
@@ -51,42 +161,95 @@ class ValidationError(Exception):
 
 
 class Failure(Exception):
-    def __init__(self, errors):
-        self.errors = errors
+    """validation failure.
+
+    errors are kept as `records` (see `ErrorRecord`), and rendered to `errors` at first access.
+    """
+    def __init__(self, errors=None, locale=None, records=None):
+        self._errors = errors
+        self.locale = locale
+        self.records = records
+
+    @property
+    def errors(self):
+        if self._errors is None:
+            self._errors = render_errors(self.records or (), translator_for(self.locale))
+        return self._errors
+
+    @errors.setter
+    def errors(self, errors):
+        self._errors = errors
 
     def __str__(self):
         return "<Failure errors={!r}>".format(self.errors)
 
+    def __reduce__(self):
+        return (self.__class__, (self._errors, self.locale, self.records))
+
 
 class Break(Exception):
     def __init__(self, value):
         self.value = value
 
 
+class _Profiling(object):
+    """the active profiler (see `tinyschema.profiling`), None when profiling is disabled"""
+    profiler = None
+
+
 class _Field(object):
+    """field object, bound to a schema instance.
+
+    `convertors` and `options` are shared with the column of the schema class,
+    options are copied at first write (via `options` or setting an unknown attribute).
+    """
+    __slots__ = ("value", "raw", "convertors", "_options", "_owned")
+
     def __init__(self, value, convertors, options):
-        self.value = value
-        self.convertors = convertors
-        self.options = options
+        _set_value(self, value)
+        _set_convertors(self, convertors)
+        _set_options(self, options)
+        _set_owned(self, False)
 
     def __getattr__(self, name):
+        if name.startswith("__") or name in _Field.__slots__:  # e.g. __setstate__ on unpickling
+            raise AttributeError(name)
         try:
-            return self.options[name]
+            return self._options[name]
         except KeyError as e:
             raise AttributeError(e)
 
+    def __setattr__(self, name, value):
+        if name in _Field.__slots__:
+            object.__setattr__(self, name, value)
+        elif name == "options":
+            _set_options(self, value)
+            _set_owned(self, True)
+        else:
+            self.options[name] = value
+
+    @property
+    def options(self):
+        if not self._owned:
+            _set_options(self, self._options.copy())
+            _set_owned(self, True)
+        return self._options
+
     def bind(self, *new_convertors, **options):
         convertors = self.convertors[:]
         convertors.extend(new_convertors)
-        new_options = self.options.copy()
+        new_options = self._options.copy()
         new_options.update(options)
         return self.__class__(self.value, convertors, new_options)
 
     def validate(self):
+        if _Profiling.profiler is not None:
+            return _Profiling.profiler.validate_field(self)
         try:
             value = self.value
+            options = self._options
             for cnv in self.convertors:
-                value = cnv(value, self.options)
+                value = cnv(value, options)
             return value
         except Break as e:
             return e.value
@@ -96,8 +259,18 @@ class _Field(object):
         except Exception as e:
             raise ValidationError(e, name=self.name)
 
+    def avalidate(self):
+        from .aio import avalidate_field
+        return avalidate_field(self)
+
     def renewal(self, value):
-        self.value = value
+        _set_value(self, value)
+
+_set_value = _Field.value.__set__
+_set_raw = _Field.raw.__set__
+_set_convertors = _Field.convertors.__set__
+_set_options = _Field._options.__set__
+_set_owned = _Field._owned.__set__
 
 
 class _Container(object):
@@ -111,6 +284,8 @@ class _Container(object):
         self.options = options
 
     def __getattr__(self, k):
+        if k.startswith("__"):
+            raise AttributeError(k)
         try:
             return getattr(self.value, k)
         except AttributeError:
@@ -119,6 +294,9 @@ class _Container(object):
     def __repr__(self):
         return "<Container {!r}>".format(self.value.__class__)
 
+    def validate(self, max_errors=None, locale=None):
+        return validate_schema(self.value, max_errors=max_errors, locale=locale)
+
     def renewal(self, value):
         pass
 
@@ -136,6 +314,8 @@ class _Collection(object):
         self.options = options
 
     def __getattr__(self, k):
+        if k.startswith("__"):
+            raise AttributeError(k)
         return self.options[k]
 
     def __getitem__(self, i):
@@ -153,8 +333,23 @@ class _Collection(object):
     def __len__(self):
         return len(self.value)
 
-    def validate(self):
-        return [v.validate() for v in self.value]
+    def validate(self, max_errors=None, locale=None):
+        executor = self.options.get("executor")
+        if executor is not None:
+            values, records = executor.validate_items(self.schema, self.options["name"], self.value)
+            if records:
+                raise Failure(records=records[:max_errors], locale=locale)
+            return values
+        return [validate_schema(v, max_errors=max_errors, locale=locale) for v in self.value]
+
+
+def validate_schema(ob, max_errors=None, locale=None):
+    kwargs = {}
+    if max_errors is not None:
+        kwargs["max_errors"] = max_errors
+    if locale is not None:
+        kwargs["locale"] = locale
+    return ob.validate(**kwargs)
 
 
 class PartialApplicationLike(object):
@@ -185,6 +380,557 @@ def column(func, *args, **kwargs):
     return v
 
 
+class ErrorRecord(object):
+    """an error of validation. the message is rendered only when `render()` is called"""
+    __slots__ = ("path", "message", "error")
+
+    def __init__(self, path, message=None, error=None):
+        self.path = path
+        self.message = message
+        self.error = error
+
+    @classmethod
+    def from_error(cls, e, path=None):
+        return cls(path or (e.name, ), e.message, e.error)
+
+    @property
+    def code(self):
+        if isinstance(self.message, translationstring.TranslationString):
+            return text_type(self.message)
+        return None
+
+    @property
+    def params(self):
+        return getattr(self.message, "mapping", None) or {}
+
+    def render(self, translate=None):
+        if self.message is None:
+            return self.error
+        if isinstance(self.message, translationstring.TranslationString):
+            return (translate or translator)(self.message)
+        return self.message
+
+    def __repr__(self):
+        return "<ErrorRecord path={!r} code={!r}>".format(self.path, self.code or self.message)
+
+
+class ErrorList(object):
+    """list of errors per index (under a Collection), only indexes having errors are stored.
+
+    it behaves as a list of dicts, `errors["ps"][99999]["x"]`, where missing items are empty.
+    used while errors are collected, `Failure.errors` has plain lists (see `as_json_errors`).
+    """
+    __slots__ = ("_items", "_length")
+
+    def __init__(self):
+        self._items = {}
+        self._length = 0
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return list(self)[i]
+        if i < 0:
+            i += self._length
+        if not 0 <= i < self._length:
+            raise IndexError(i)
+        node = self._items.get(i)
+        return ErrorTree() if node is None else node
+
+    def node(self, i):
+        """errors of index i, created if missing"""
+        try:
+            return self._items[i]
+        except KeyError:
+            node = self._items[i] = ErrorTree()
+            self._length = max(self._length, i + 1)
+            return node
+
+    def __len__(self):
+        return self._length
+
+    def __iter__(self):
+        items = self._items
+        for i in range(self._length):
+            node = items.get(i)
+            yield ErrorTree() if node is None else node
+
+    def items(self):
+        """(index, errors) of indexes having errors, in order"""
+        return sorted(self._items.items())
+
+    def __eq__(self, other):
+        if not isinstance(other, (list, tuple, ErrorList)) or len(other) != self._length:
+            return False
+        return all(x == y for x, y in zip(self, other))
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return "<ErrorList length={} {!r}>".format(self._length, dict(self.items()))
+
+    def __getstate__(self):
+        return (self._items, self._length)
+
+    def __setstate__(self, state):
+        self._items, self._length = state
+
+    def as_json(self):
+        """dense list of dicts (same as the errors of older versions)"""
+        return [as_json_errors(node) for node in self]
+
+
+class ErrorTree(defaultdict):
+    """nested errors, e.g. {"x": ["required"], "ps": ErrorList([..., {"y": ["required"]}])}"""
+    def __init__(self, default_factory=list, *args, **kwargs):
+        super(ErrorTree, self).__init__(default_factory, *args, **kwargs)
+
+    def add(self, path, message):
+        insert_error(self, path, message)
+
+    def as_json(self):
+        return defaultdict(list, ((k, as_json_errors(v)) for k, v in self.items()))
+
+
+def as_json_errors(errors):
+    """plain defaultdicts and lists of errors (the shape of `Failure.errors`, e.g. for json.dumps)"""
+    if isinstance(errors, (ErrorTree, ErrorList)):
+        return errors.as_json()
+    if isinstance(errors, defaultdict):
+        return defaultdict(errors.default_factory, ((k, as_json_errors(v)) for k, v in errors.items()))
+    if isinstance(errors, dict):
+        return {k: as_json_errors(v) for k, v in errors.items()}
+    if isinstance(errors, list):
+        return [as_json_errors(v) for v in errors]
+    return errors
+
+
+def insert_error(errors, path, message):
+    """e.g. path=("ps", 1, "x") -> errors["ps"][1]["x"]. memory is proportional to the number of errors"""
+    target = errors
+    for k, next_k in zip(path, path[1:]):
+        if isinstance(target, ErrorList):
+            target = target.node(k)
+            continue
+        if isinstance(target, list):
+            target = target[k]
+            continue
+        node = target.get(k)
+        if not node:
+            node = target[k] = ErrorList() if isinstance(next_k, int) else ErrorTree()
+        target = node
+    target[path[-1]].append(message)
+
+
+def render_errors(records, translate=None):
+    errors = ErrorTree()
+    nested = False
+    for record in records:
+        if len(record.path) == 1:
+            errors[record.path[0]].append(record.render(translate))
+        else:
+            insert_error(errors, record.path, record.render(translate))
+            nested = True
+    return errors.as_json() if nested else defaultdict(list, errors)
+
+
+def collect_error(errors, e, translate=None):
+    errors[e.name].append(ErrorRecord.from_error(e).render(translate))
+
+
+def _plan_of(column, name):
+    """convertors and options (shared by fields) of a plain field column, or None when it cannot be inlined"""
+    if not isinstance(column, PartialApplicationLike) or column.func is not _Field:
+        return None
+    options = column.options.copy()
+    options["name"] = name
+    return column.args, options
+
+
+def _subschema_of(column):
+    """(factory, schema) of a Container/Collection column, or None"""
+    if not isinstance(column, PartialApplicationLike) or not isinstance(column.func, partial):
+        return None
+    if column.func.func not in (_Container, _Collection):
+        return None
+    return column.func.func, column.func.args[0]
+
+
+def _is_object(schema, value):
+    return isinstance(value, (schema, Mapping))
+
+
+def _is_objects(schema, value):
+    """value of a Collection field is a list of objects"""
+    return isinstance(value, (list, tuple)) and all(isinstance(v, (schema, Mapping)) for v in value)
+
+
+def _validate_child(schema, value):
+    if isinstance(value, schema):
+        return value.validate()
+    return schema.validate_dict(value)
+
+
+def iterate_validation(schema, rows, locale=None):
+    """yield validated values or Failure per each row (dict)"""
+    if schema.result_cache is not None and schema._cacheable:
+        for row in rows:
+            try:
+                yield schema.result_cache.validate(schema, row, locale=locale)
+            except Failure as e:
+                yield e
+        return
+
+    validate_dict = schema._validate_dict
+    for row in rows:
+        try:
+            values, records = validate_dict(row)
+        except Failure as e:  # from nested schema
+            yield e
+            continue
+        yield Failure(records=records, locale=locale) if records else values
+
+
+_REQUIRED = _("required")
+_NOT_OBJECT = _("object is expected")
+_NOT_OBJECTS = _("list of objects is expected")
+
+
+def _chain_lines(env, i, name, convertors, options, indent):
+    """inlined convertor chain, reading and writing the local variable `value`"""
+    lines = [indent + "try:", indent + "    try:"]
+    body_indent = indent + "        "
+    for j, cnv in enumerate(convertors):
+        if cnv is reject_None and j == 0:
+            if options.get("required", True):
+                lines.append(body_indent + "if value is None:")
+                lines.append(body_indent + "    raise ValidationError(None, message=_REQUIRED)")
+            else:
+                env["_d{}".format(i)] = options.get("default")
+                lines.append(body_indent + "if value is None:")
+                lines.append(body_indent + "    value = _d{}".format(i))
+                lines.append(body_indent + "else:")
+                body_indent += "    "
+            continue
+        env["_c{}_{}".format(i, j)] = cnv
+        lines.append(body_indent + "value = _c{i}_{j}(value, _o{i})".format(i=i, j=j))
+    if lines[-1].endswith(":"):
+        lines.append(body_indent + "pass")
+    lines.append(indent + "    except Break as e:")
+    lines.append(indent + "        value = e.value")
+    return lines
+
+
+_STOP_LINES = [
+    "if max_errors is not None and len(records) >= max_errors:",
+    "    raise Failure(records=records, locale=locale)",
+]
+
+
+def _error_lines(name, indent, stop=True):
+    stop = [indent + "    " + line for line in _STOP_LINES] if stop else []
+    return [
+        indent + "except ValidationError as e:",
+        indent + "    records.append(ErrorRecord(({!r}, ), e.message, e.error))".format(name),
+    ] + stop + [
+        indent + "except Exception as e:",
+        indent + "    records.append(ErrorRecord(({!r}, ), None, e))".format(name),
+    ] + stop
+
+
+def _compile(lines, env, fnname):
+    env.update({
+        "_Field": _Field,
+        "_set_value": _set_value,
+        "_set_raw": _set_raw,
+        "Break": Break,
+        "ValidationError": ValidationError,
+        "Failure": Failure,
+        "OrderedDict": OrderedDict,
+        "defaultdict": defaultdict,
+        "ErrorRecord": ErrorRecord,
+        "_validate_child": _validate_child,
+        "_REQUIRED": _REQUIRED,
+        "_NOT_OBJECT": _NOT_OBJECT,
+        "_NOT_OBJECTS": _NOT_OBJECTS,
+        "_is_object": _is_object,
+        "_is_objects": _is_objects,
+        "_Profiling": _Profiling,
+        "_snapshot": _snapshot,
+        "_unchanged": _unchanged,
+    })
+    exec("\n".join(lines), env)
+    fn = env[fnname]
+    fn._generated = True
+    return fn
+
+
+_IMMUTABLE = (type(None), bool, int, float, complex, str, bytes, frozenset)
+_NO_SNAPSHOT = object()
+
+
+def _snapshot(value):
+    """copy of a mutable value of an incremental field, for finding in-place changes"""
+    if isinstance(value, _IMMUTABLE):
+        return value
+    try:
+        return copy.deepcopy(value)
+    except Exception:
+        return _NO_SNAPSHOT  # validated again each time
+
+
+def _unchanged(value, validated, snapshot):
+    return value is validated and (snapshot is value or snapshot == value)
+
+
+def compile_validate(cls):
+    """generate `_validate` specialized for cls.
+
+    each field's convertor chain is inlined with options resolved at class creation.
+    fields replaced or reconfigured after construction (e.g. by `bind()`) fall back to `validate()` of the field.
+
+    if cls.incremental is true, validated fields are remembered (in `_validated` of the instance),
+    and a field is not validated again until the field object, its value, convertors or options are changed.
+    a mutable value (e.g. a list) is compared with a copy taken at validation, so in-place changes are found.
+    """
+    env = {}
+    incremental = getattr(cls, "incremental", False)
+    lines = [
+        "def _validate(self, max_errors=None, locale=None):",
+        "    if _Profiling.profiler is not None:",
+        "        return _Profiling.profiler.validate_schema(self, max_errors, locale)",
+        "    records = []",
+        "    values = OrderedDict()",
+        "    d = self.__dict__",
+    ]
+    if incremental:
+        lines.append("    last = d.get('_validated')")
+        lines.append("    if last is None:")
+        lines.append("        last = d['_validated'] = {}")
+    for i, name in enumerate(cls.fieldnames):
+        plan = cls._fieldplans[name]
+        if _subschema_of(getattr(cls, name)) is None:
+            call = "current.validate()"
+        else:
+            call = "current.validate(max_errors=None if max_errors is None else max_errors - len(records), locale=locale)"
+        generic = [
+            "try:",
+            "    current.raw = current.value",
+            "    validated = {}".format(call),
+            "    values[{!r}] = validated".format(name),
+            "    current.renewal(validated)",
+        ]
+        if incremental:
+            generic.extend([
+                "    if current.__class__ is _Field:",
+                "        last[{!r}] = (current, validated, list(current.convertors), dict(current._options),"
+                " _snapshot(validated))".format(name),
+            ])
+        generic.extend([
+            "except ValidationError as e:",
+            "    records.append(ErrorRecord.from_error(e))",
+        ] + ["    " + line for line in _STOP_LINES])
+        if incremental:
+            generic = [
+                "entry = last.get({!r})".format(name),
+                "if (entry is not None and entry[0] is current and _unchanged(current.value, entry[1], entry[4])"
+                " and entry[2] == current.convertors and entry[3] == current._options):",
+                "    values[{!r}] = current.value".format(name),
+                "else:",
+            ] + ["    " + line for line in generic]
+        if plan is None:
+            lines.append("    current = self.{}".format(name))
+            lines.extend("    " + line for line in generic)
+            continue
+
+        convertors, options = plan
+        env["_cs{}".format(i)] = convertors
+        env["_o{}".format(i)] = options
+        lines.append("    current = d.get({!r})".format(name))
+        lines.append("    if current is None:")
+        lines.append("        current = d[{!r}] = _Field(d['_unbound'].get({!r}, None), _cs{}, _o{})".format(name, name, i, i))
+        lines.append("    if current.__class__ is _Field and current.convertors is _cs{i} and current._options is _o{i}:".format(i=i))
+        lines.append("        value = current.value")
+        indent = "        "
+        if incremental:
+            lines.append("        entry = last.get({!r})".format(name))
+            lines.append("        if entry is not None and entry[0] is current and _unchanged(value, entry[1], entry[4]):")
+            lines.append("            values[{!r}] = value".format(name))
+            lines.append("        else:")
+            indent = "            "
+        lines.append(indent + "_set_raw(current, value)")
+        lines.extend(_chain_lines(env, i, name, convertors, options, indent))
+        lines.append(indent + "    values[{!r}] = value".format(name))
+        lines.append(indent + "    _set_value(current, value)")
+        if incremental:
+            lines.append(indent + "    last[{!r}] = (current, value, _cs{i}, _o{i}, _snapshot(value))".format(name, i=i))
+        lines.extend(_error_lines(name, indent))
+        lines.append("    else:")
+        lines.extend("        " + line for line in generic)
+    lines.append("    if records:")
+    lines.append("        raise Failure(records=records, locale=locale)")
+    lines.append("    return values")
+    return _compile(lines, env, "_validate")
+
+
+def invalidate(ob, *names):
+    """forget validated fields of an incremental schema instance (all fields, if names are not given)"""
+    last = ob.__dict__.get("_validated")
+    if not last:
+        return
+    if not names:
+        last.clear()
+    for name in names:
+        last.pop(name, None)
+
+
+def compile_validate_dict(cls, profiled=False):
+    """generate `_validate_dict` specialized for cls.
+
+    `_validate_dict(data)` returns a pair of (values, records), records is empty on success.
+    same as `cls.fromdict(data).validate()`, but `data` is not modified and no field objects are created.
+
+    if profiled is true, the generated function is `_validate_dict(cls, data, profiler)`
+    and convertor chains are run by the profiler (see `tinyschema.profiling`).
+    """
+    env = {}
+    if profiled:
+        lines = ["def _validate_dict(cls, data, profiler):"]
+    else:
+        lines = [
+            "def _validate_dict(cls, data):",
+            "    if _Profiling.profiler is not None:",
+            "        return _Profiling.profiler.validate_dict(cls, data)",
+        ]
+    lines += [
+        "    records = []",
+        "    values = OrderedDict()",
+        "    get = data.get",
+    ]
+    for i, name in enumerate(cls.fieldnames):
+        column = getattr(cls, name)
+        lines.append("    value = get({!r})".format(name))
+        plan = cls._fieldplans[name]
+        if plan is not None:
+            convertors, options = plan
+            env["_o{}".format(i)] = options
+            if profiled:
+                env["_cs{}".format(i)] = convertors
+                key = "{}.{}".format(cls.__name__, name)
+                lines.append("    try:")
+                lines.append("        values[{!r}] = profiler._run_chain({!r}, value, _cs{i}, _o{i})".format(name, key, i=i))
+            else:
+                lines.extend(_chain_lines(env, i, name, convertors, options, "    "))
+                lines.append("        values[{!r}] = value".format(name))
+            lines.extend(_error_lines(name, "    ", stop=False))
+            continue
+
+        sub = _subschema_of(column)
+        if sub is None:
+            env["_col{}".format(i)] = column
+            lines.append("    try:")
+            lines.append("        values[{!r}] = _col{}(value, name={!r}).validate()".format(name, i, name))
+            lines.append("    except ValidationError as e:")
+            lines.append("        records.append(ErrorRecord.from_error(e))")
+            continue
+
+        factory, schema = sub
+        env["_s{}".format(i)] = schema
+        lines.append("    if value is None:")
+        if column.options.get("required", True):
+            lines.append("        records.append(ErrorRecord(({!r}, ), _REQUIRED))".format(name))
+        else:
+            lines.append("        values[{!r}] = None".format(name))
+        if factory is _Container:
+            lines.append("    elif not _is_object(_s{}, value):".format(i))
+            lines.append("        records.append(ErrorRecord(({!r}, ), _NOT_OBJECT))".format(name))
+            lines.append("    else:")
+            lines.append("        values[{!r}] = _validate_child(_s{}, value)".format(name, i))
+            continue
+        lines.append("    elif not _is_objects(_s{}, value):".format(i))
+        lines.append("        records.append(ErrorRecord(({!r}, ), _NOT_OBJECTS))".format(name))
+        if column.options.get("executor") is not None:
+            env["_ex{}".format(i)] = column.options["executor"]
+            lines.append("    else:")
+            lines.append("        values[{!r}], found = _ex{}.validate_items(_s{}, {!r}, value)".format(name, i, i, name))
+            lines.append("        records.extend(found)")
+        else:
+            lines.append("    else:")
+            lines.append("        values[{!r}] = [_validate_child(_s{}, v) for v in value]".format(name, i))
+    lines.append("    return values, records")
+    return _compile(lines, env, "_validate_dict")
+
+
+def _lazy_validate(cls):
+    """`_validate` compiling the real one at first call, creating a schema class stays cheap"""
+    def _validate(self, max_errors=None, locale=None):
+        if cls.__dict__.get("_validate") is _validate:
+            cls._validate = compile_validate(cls)
+        return cls.__dict__["_validate"](self, max_errors=max_errors, locale=locale)
+    _validate._generated = True
+    return _validate
+
+
+def _lazy_validate_dict(cls):
+    """`_validate_dict` compiling the real one at first call"""
+    def _validate_dict(klass, data):
+        if cls.__dict__.get("_validate_dict") is lazy:
+            cls._validate_dict = classmethod(compile_validate_dict(cls))
+        return cls.__dict__["_validate_dict"].__func__(klass, data)
+    _validate_dict._generated = True
+    lazy = classmethod(_validate_dict)
+    return lazy
+
+
+def _cacheable_of(cls):
+    """False if some field (or sub schema) has `cacheable=False` option, e.g. non-deterministic convertors"""
+    for name in cls.fieldnames:
+        column = getattr(cls, name)
+        if getattr(column, "options", {}).get("cacheable", True) is False:
+            return False
+        sub = _subschema_of(column)
+        if sub is not None and not getattr(sub[1], "_cacheable", True):
+            return False
+    return True
+
+
+class _LazyField(object):
+    """column of a schema class. a field object is created at first access from the instance.
+
+    accessing from the class returns the column itself.
+    """
+    def __init__(self, column, name, plan):
+        self.column = column
+        self.name = name
+        self.plan = plan
+        self._column_counter = column._column_counter
+
+    def __get__(self, ob, cls):
+        if ob is None:
+            return self.column
+        d = ob.__dict__
+        value = d["_unbound"].get(self.name, None)
+        if self.plan is None:
+            field = self.column(value, name=self.name)
+        else:
+            field = _Field(value, *self.plan)
+        d[self.name] = field
+        return field
+
+
+def compile_init(cls):
+    """generate `__init__`. field objects are not created here, see `_LazyField`"""
+    template = """\
+def __init__(self, {kwargs}):
+    self._unbound = {{{body}}}
+    """
+    kwargs = ", ".join(["{}=None".format(name) for name in cls.fieldnames])
+    body = ", ".join("'{x}': {x}".format(x=name) for name in cls.fieldnames)
+    env = {}
+    exec(template.format(kwargs=kwargs, body=body), env)
+    return env["__init__"]
+
+
 def as_schema(cls):
     xs = []
     s = set()
@@ -196,6 +942,14 @@ def as_schema(cls):
                     s.add(name)
 
     cls.fieldnames = [name for (_, name) in sorted(xs, key=lambda xs: xs[0])]
+    cls._fieldplans = {name: _plan_of(getattr(cls, name), name) for name in cls.fieldnames}
+    for name in cls.fieldnames:
+        setattr(cls, name, _LazyField(getattr(cls, name), name, cls._fieldplans[name]))
+
+    # result cache (see tinyschema.cache)
+    if not hasattr(cls, "result_cache"):
+        cls.result_cache = None
+    cls._cacheable = _cacheable_of(cls)
 
     # iter
     if not hasattr(cls, "__iter__"):
@@ -216,46 +970,53 @@ def as_schema(cls):
             return ob
         cls.fromdict = fromdict
 
-    # validate
-    if not hasattr(cls, "_validate"):
-        def _validate(self):
-            errors = defaultdict(list)
-            values = OrderedDict()
-            for name in self.fieldnames:
-                try:
-                    current = getattr(self, name)
-                    current.raw = current.value  # xxx
-                    validated = current.validate()
-                    values[name] = validated
-                    current.renewal(validated)
-                except ValidationError as e:
-                    if e.message is not None:
-                        if isinstance(e.message, translationstring.TranslationString):
-                            errors[e.name].append(get_translator()(e.message))
-                        else:
-                            errors[e.name].append(e.message)
-                    else:
-                        errors[e.name].append(e.error)
-            if errors:
-                raise Failure(errors=errors)
+    # validate (compiled at first call)
+    current_validate = getattr(cls, "_validate", None)
+    if current_validate is None or getattr(current_validate, "_generated", False):
+        cls._validate = _lazy_validate(cls)
+
+    current_validate_dict = getattr(cls, "_validate_dict", None)
+    if current_validate_dict is None or getattr(current_validate_dict, "_generated", False):
+        cls._validate_dict = _lazy_validate_dict(cls)
+
+    if not hasattr(cls, "validate_dict"):
+        @classmethod
+        def validate_dict(cls, data, locale=None):
+            if cls.result_cache is not None and cls._cacheable:
+                return cls.result_cache.validate(cls, data, locale=locale)
+            values, records = cls._validate_dict(data)
+            if records:
+                raise Failure(records=records, locale=locale)
             return values
-        cls._validate = _validate
+        cls.validate_dict = validate_dict
+
+    if not hasattr(cls, "validate_many"):
+        @classmethod
+        def validate_many(cls, rows, locale=None):
+            return list(iterate_validation(cls, rows, locale=locale))
+        cls.validate_many = validate_many
 
     if not hasattr(cls, "validate"):
-        def validate(self):
-            return self._validate()
+        def validate(self, max_errors=None, locale=None):
+            """validate all fields. if max_errors is given, Failure is raised when the number of errors reaches it.
+            error messages are translated for locale (default: see `set_translator`).
+            """
+            kwargs = {}
+            if max_errors is not None:
+                kwargs["max_errors"] = max_errors
+            if locale is not None:
+                kwargs["locale"] = locale
+            return self._validate(**kwargs)
         cls.validate = validate
 
+    if not hasattr(cls, "avalidate"):
+        def avalidate(self, concurrency=None, locale=None):
+            from .aio import avalidate
+            return avalidate(self, concurrency=concurrency, locale=locale)
+        cls.avalidate = avalidate
+
     # init
-    template = """\
-def __init__(self, {kwargs}):
-    cls = self.__class__
-    {body}
-    """
-    kwargs = ", ".join(["{}=None".format(name) for name in cls.fieldnames])
-    body = "\n    ".join("self.{x} = getattr(cls, '{x}')({x}, name='{x}')".format(x=name) for name in cls.fieldnames)
-    exec(template.format(kwargs=kwargs, body=body))
-    cls.__init__ = locals()["__init__"]
+    cls.__init__ = compile_init(cls)
     return cls
 
 
@@ -268,40 +1029,81 @@ Schema = SchemaMeta("Schema", (object, ), {})
 
 
 # field validation
+class _Joined(object):
+    """comma separated text of values, joined when the message is rendered. at most `limit` values are shown"""
+    __hash__ = None
+
+    def __init__(self, values, limit=None):
+        self.values = values
+        self.limit = limit
+
+    def __str__(self):
+        if self.limit is None:
+            return u', '.join([text_type(text_(x)) for x in self.values])
+        head = [text_type(text_(x)) for x in islice(self.values, self.limit + 1)]
+        if len(head) > self.limit:
+            head[self.limit:] = [u"..."]
+        return u', '.join(head)
+
+
 class Any(object):
     def __init__(self, validators):
         self.validators = validators
 
     def __call__(self, val, options):
-        errors = []
         for v in self.validators:
             try:
-                val = v(val, options)
-                return val
+                return v(val, options)
             except Exception:
-                errors.append((_("${val} is not validation suceeed.", mapping={"val": val})))
-        e = errors[0]
-        raise ValidationError(error=e, message=e.message)
+                pass
+        raise ValidationError(message=(_("${val} is not validation suceeed.", mapping={"val": val})))
 
 
 class Regex(object):
-    def __init__(self, rx, msg=None):
-        if isinstance(rx, string_types):
-            self.rx = re.compile(rx)
-            self.msg = msg
-        else:
-            self.rx = rx
+    """prefilter is checked before matching (e.g. Prefilter(max_length=...)), to reject values cheaply.
+
+    with timeout (seconds), matching is time-boxed by the regex module, a timed-out value is invalid.
+    use it for patterns which can backtrack (prefilter does not bound their matching time).
+    """
+    def __init__(self, rx, msg=None, prefilter=None, timeout=None):
+        if timeout is not None:
+            if isinstance(rx, string_types):
+                rx = compile_timeboxed(rx)
+            else:
+                rx = compile_timeboxed(rx.pattern, rx.flags)
+        elif isinstance(rx, string_types):
+            rx = compile_pattern(rx)
+        self.rx = rx
+        self.msg = msg
+        self.prefilter = prefilter
+        self.timeout = timeout
+
+    def _match(self, val):
+        if self.timeout is None:
+            return self.rx.match(val)
+        return match_timeboxed(self.rx, val, self.timeout)
 
     def __call__(self, val, options):
-        if self.rx.match(val) is None:
+        if (self.prefilter is not None and not self.prefilter(val)) or self._match(val) is None:
             if self.msg:
                 msg = self.msg(val)
-            msg = _("invalid email ${val}", mapping={"val": val})
+            else:
+                msg = _("invalid email ${val}", mapping={"val": val})
             raise ValidationError(message=(msg))
         return val
 
-EMAIL_RE = "(?i)^[A-Z0-9._%!#$%&'*+-/=?^_`{|}~()]+@[A-Z0-9]+([.-][A-Z0-9]+)*\.[A-Z]{2,22}$"
-EMail = partial(Regex, EMAIL_RE, lambda val: (_("${val} is not url", mapping={"val": val})))
+EMAIL_RE = r"(?i)^[A-Z0-9._%!#$%&'*+-/=?^_`{|}~()]+@[A-Z0-9]+([.-][A-Z0-9]+)*\.[A-Z]{2,22}$"
+EMAIL_PREFILTER = Prefilter(max_length=254, contains=("@", "."))
+
+
+def _email_message(val):
+    return _("invalid email ${val}", mapping={"val": val})
+
+
+def _url_message(val):
+    return _("${val} is not url", mapping={"val": val})
+
+EMail = partial(Regex, EMAIL_RE, _email_message, prefilter=EMAIL_PREFILTER)
 
 
 class Range(object):
@@ -310,9 +1112,9 @@ class Range(object):
         self.max = max
 
     def __call__(self, val, options):
-        if self.min > self.val:
+        if self.min > val:
             raise ValidationError(message=(_("${val} is smaller than ${min}", mapping={"val": val, "min": self.min})))
-        if self.max < self.val:
+        if self.max < val:
             raise ValidationError(message=(_("${val} is bigger than ${max}", mapping={"val": val, "max": self.max})))
         return val
 
@@ -331,31 +1133,42 @@ class Length(object):
 
 
 class OneOf(object):
-    def __init__(self, choices):
+    """choices can be a ChoiceIndex, to share a large set of choices between fields"""
+    def __init__(self, choices, limit=10):
         self.choices = choices
+        self.index = as_choice_index(choices)
+        self.limit = limit
 
     def __call__(self, val, options):
-        if val not in self.choices:
-            candidates = u', '.join([text_(x) for x in self.choices])
+        if val not in self.index:
+            candidates = _Joined(self.index, limit=self.limit)
             raise ValidationError(message=(_("${val} is not in ${candidates}", mapping={"val": val, "candidates": candidates})))
-            raise ValueError(self.choices)
         return val
 
 
 class Subset(object):
-    def __init__(self, choices):
+    """choices can be a ChoiceIndex, to share a large set of choices between fields"""
+    def __init__(self, choices, limit=10):
         self.choices = choices
+        self.index = as_choice_index(choices)
+        self.limit = limit
 
     def __call__(self, val, options):
-        if not set(val).issubset(self.choices):
-            sval = u', '.join([text_(x) for x in val])
-            candidates = u', '.join([text_(x) for x in self.choices])
+        if hasattr(self.index, "issuperset"):
+            ok = self.index.issuperset(val)
+        else:
+            ok = set(val).issubset(self.index)
+        if not ok:
+            sval = _Joined(val, limit=self.limit)
+            candidates = _Joined(self.index, limit=self.limit)
             raise ValidationError(message=(_("${val} is not subset of  ${candidates}", mapping={"val": sval, "candidates": candidates})))
         return val
 
-URL_REGEX = r"""(?i)\b((?:[a-z][\w-]+:(?:/{1,3}|[a-z0-9%])|www\d{0,3}[.]|[a-z0-9.\-]+[.][a-z]{2,4}/)(?:[^\s()<>]+|\(([^\s()<>]+|(\([^\s()<>]+\)))*\))+(?:\(([^\s()<>]+|(\([^\s()<>]+\)))*\)|[^\s`!()\[\]{};:'".,<>?«»“”‘’]))"""  # "emacs!
+# each repetition consumes one character or one parenthesized group, so matching doesn't backtrack exponentially
+URL_REGEX = r"""(?i)\b((?:[a-z][\w-]+:(?:/{1,3}|[a-z0-9%])|www\d{0,3}[.]|[a-z0-9.\-]+[.][a-z]{2,4}/)(?:[^\s()<>]|\((?:[^\s()<>]|\([^\s()<>]+\))*\))+(?:\((?:[^\s()<>]|\([^\s()<>]+\))*\)|[^\s`!()\[\]{};:'".,<>?«»“”‘’]))"""  # "emacs!
+URL_PREFILTER = Prefilter(max_length=2083)
 
-URL = Regex(URL_REGEX)
+URL = Regex(URL_REGEX, _url_message, prefilter=URL_PREFILTER)
 
 
 def reject_None(val, options):
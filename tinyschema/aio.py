@@ -0,0 +1,218 @@
+# -*- coding:utf-8 -*-
+"""
+asyncio version of validation. convertors and validation methods can be coroutine functions.
+"""
+import logging
+logger = logging.getLogger(__name__)
+import asyncio
+import inspect
+from collections import OrderedDict
+from . import (
+    _Field,
+    _Container,
+    _Collection,
+    Break,
+    ValidationError,
+    Failure,
+    ErrorRecord,
+    ErrorTree,
+    as_json_errors
+)
+from . import datavalidation as dv
+
+
+class _Unlimited(object):
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+def _limit(concurrency):
+    if concurrency is None:
+        return _Unlimited()
+    return asyncio.Semaphore(concurrency)
+
+
+async def _resolve(value):
+    if inspect.isawaitable(value):
+        return await value
+    return value
+
+
+async def _avalidate_field(field, limit, locale=None):
+    if isinstance(field, _Container):
+        return await _avalidate_schema(field.value, limit, locale)
+    if isinstance(field, _Collection):
+        return list(await asyncio.gather(*[_avalidate_schema(v, limit, locale) for v in field.value]))
+    if not isinstance(field, _Field):
+        return field.validate()
+
+    async with limit:
+        try:
+            value = field.value
+            options = field._options
+            for cnv in field.convertors:
+                value = await _resolve(cnv(value, options))
+            return value
+        except Break as e:
+            return e.value
+        except ValidationError as e:
+            e.name = field.name
+            raise
+        except Exception as e:
+            raise ValidationError(e, name=field.name)
+
+
+async def _avalidate_schema(schema, limit, locale=None):
+    async def run(current):
+        current.raw = current.value
+        try:
+            validated = await _avalidate_field(current, limit, locale)
+        except ValidationError as e:
+            return None, e
+        current.renewal(validated)
+        return validated, None
+
+    fields = [getattr(schema, name) for name in schema.fieldnames]
+    results = await asyncio.gather(*[run(current) for current in fields])
+
+    records = []
+    values = OrderedDict()
+    for name, (validated, e) in zip(schema.fieldnames, results):
+        if e is None:
+            values[name] = validated
+        else:
+            records.append(ErrorRecord.from_error(e))
+    if records:
+        raise Failure(records=records, locale=locale)
+    return values
+
+
+async def avalidate_field(field, concurrency=None):
+    """same as field.validate(), but coroutine convertors are awaited"""
+    return await _avalidate_field(field, _limit(concurrency))
+
+
+async def avalidate(schema, concurrency=None, locale=None):
+    """same as schema.validate(), but fields are validated concurrently.
+    `concurrency` is the number of convertor chains running at the same time (None is unlimited).
+    """
+    return await _avalidate_schema(schema, _limit(concurrency), locale)
+
+
+async def _run_validator(parent, v, params, limit):
+    if isinstance(v, dv.Container):
+        if v.name in params:
+            for child in v.validators:
+                await _run_child(parent, v, child, params[v.name], [v.name])
+        return
+    if isinstance(v, dv.Collection):
+        if v.name in params:
+            for i, target in enumerate(params[v.name]):
+                for child in v.validators:
+                    await _run_child(parent, v, child, target, [v.name, i])
+        return
+    async with limit:
+        await _resolve(v(parent, params))
+
+
+async def _run_child(parent, v, child, target, prefix):
+    try:
+        await _run_validator(parent, child, target, _Unlimited())
+    except (parent.Exception, parent.Interrupt) as e:
+        e.position = dv._child_position(prefix, child, e)
+        raise
+
+
+async def _aconfigure(vobject, ob, concurrency, max_errors, locale):
+    if type(vobject).configure is not dv._ValidationObject.configure:  # overridden, may be a coroutine
+        return await _resolve(dv._configure(vobject, ob, max_errors=max_errors, locale=locale))
+    try:
+        return await avalidate(ob, concurrency=concurrency, locale=locale), ErrorTree()
+    except Failure as e:
+        return {}, e.errors
+
+
+async def _arun_incremental(vobject, v, params, limit, outcomes):
+    inputs = dv._reuse_outcome(vobject, v, params, outcomes)
+    if inputs is None:
+        return
+    try:
+        await _run_validator(vobject, v, params, limit)
+    except (vobject.Exception, vobject.Interrupt) as e:
+        dv._store_outcome(vobject, v, inputs, outcomes, e)
+        raise
+    dv._store_outcome(vobject, v, inputs, outcomes)
+
+
+def _is_barrier(v):
+    return isinstance(v, dv.Convert) or dv._requirement_of(v)[1] == dv._ALWAYS
+
+
+def _groups(validators):
+    """validators split at barriers (Convert), in order. a barrier is a group by itself"""
+    group = []
+    for v in validators:
+        if _is_barrier(v):
+            if group:
+                yield group
+                group = []
+            yield [v]
+        else:
+            group.append(v)
+    if group:
+        yield group
+
+
+async def avalidate_object(vobject, ob, concurrency=None, locale=None, max_errors=None, fields=None):
+    """same as vobject(ob) for a ValidationObject, but validators are run concurrently.
+
+    configure(), max_errors, incremental and fields are treated as vobject(ob). Convert validators are
+    barriers (they can change params): validators before a Convert are finished before it runs, and
+    validators after it start after it. validators between barriers are run at the same time, so
+    max_errors limits the reported errors (in the order of validators).
+    """
+    if max_errors is None:
+        max_errors = vobject.max_errors
+    if fields is not None:
+        fields = frozenset(fields)
+    limit = _limit(concurrency)
+    params, errors = await _aconfigure(vobject, ob, concurrency, max_errors, locale)
+    if errors:
+        return vobject.on_failure(ob, params, errors)
+
+    outcomes = dv._outcomes_of(vobject, ob)
+    selected = [v for v, _ in vobject._plan.select(params, fields)]
+
+    async def run(v):
+        try:
+            if outcomes is not None and dv._is_pure(v):
+                await _arun_incremental(vobject, v, params, limit, outcomes)
+            else:
+                await _run_validator(vobject, v, params, limit)
+        except (vobject.Exception, vobject.Interrupt) as e:
+            return e
+
+    status = True
+    n_errors = 0
+    for group in _groups(selected):
+        results = await asyncio.gather(*[run(v) for v in group])
+        stopped = False
+        for v, e in zip(group, results):
+            if e is None:
+                continue
+            status = False
+            vobject.catch_error(params, errors, v, e)
+            n_errors += 1
+            if isinstance(e, vobject.Interrupt) or (max_errors is not None and n_errors >= max_errors):
+                stopped = True
+                break
+        if stopped:
+            break
+
+    if status:
+        return vobject.on_success(ob, params)
+    else:
+        return vobject.on_failure(ob, params, as_json_errors(errors))
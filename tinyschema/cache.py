@@ -0,0 +1,129 @@
+# -*- coding:utf-8 -*-
+"""
+cache of validation results, for identical payloads (retries, polling, ...).
+
+.. code:: python
+
+    class Point(t.Schema):
+        result_cache = ResultCache(maxsize=10000, ttl=60)
+        x = t.column(t.IntegerField)
+        # fields with non-deterministic convertors opt out, the schema is not cached
+        token = t.column(t.TextField, post=check_token, cacheable=False)
+
+`validate_dict()` and `validate_many()` of the schema use the cache.
+"""
+import logging
+logger = logging.getLogger(__name__)
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from . import (
+    Failure,
+    get_translator
+)
+
+
+def canonical_key(data):
+    """hash of json-like data (same for equal data, in any key order). None if data is not json-like"""
+    try:
+        dumped = json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    except (TypeError, ValueError):
+        return None
+    return hashlib.blake2b(dumped.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+
+def body_key(body):
+    """hash of raw bytes, e.g. a request body"""
+    return hashlib.blake2b(body, digest_size=16, person=b"tinyschema.body").digest()
+
+
+def _copied(ob):
+    # validated values are shared by cache hits, so containers are copied (leaves are not)
+    if isinstance(ob, dict):
+        return ob.__class__((k, _copied(v)) for k, v in ob.items())
+    if isinstance(ob, list):
+        return [_copied(v) for v in ob]
+    return ob
+
+
+def _locale_key(locale):
+    # messages can be rendered by convertors, so the active locale is a part of the key
+    return locale if locale is not None else getattr(get_translator(), "locale", None)
+
+
+def _finish(result, locale):
+    values, records = result
+    if records:
+        raise Failure(records=list(records), locale=locale)
+    return _copied(values)
+
+
+class ResultCache(object):
+    """LRU cache of (values, records), entries expire after ttl seconds (if given). thread safe"""
+    def __init__(self, maxsize=1024, ttl=None, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires, result = entry
+            if expires is not None and expires <= self.clock():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def put(self, key, result):
+        expires = None if self.ttl is None else self.clock() + self.ttl
+        with self._lock:
+            self._entries[key] = (expires, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def validate(self, schema, data, locale=None):
+        """same as schema.validate_dict(data), returns the cached result for the same data and locale"""
+        key = canonical_key(data)
+        if key is None:
+            return _finish(schema._validate_dict(data), locale)
+        key = (schema, key, _locale_key(locale))
+        result = self.get(key)
+        if result is None:
+            result = schema._validate_dict(data)
+            self.put(key, result)
+        return _finish(result, locale)
+
+
+def validate_body(schema, body, locale=None, loads=None):
+    """validate a raw json body. the body is not decoded for a cache hit (if schema has `result_cache`)"""
+    if loads is None:
+        from .parser import from_json as loads
+    cache = getattr(schema, "result_cache", None)
+    if cache is None or not schema._cacheable:
+        return schema.validate_dict(loads(body), locale=locale)
+    key = (schema, body_key(body), _locale_key(locale))
+    result = cache.get(key)
+    if result is None:
+        result = schema._validate_dict(loads(body))
+        cache.put(key, result)
+    return _finish(result, locale)
@@ -0,0 +1,110 @@
+# -*- coding:utf-8 -*-
+"""
+choice indexes for OneOf and Subset. an index is frozen, so it can be shared between fields and schemas.
+"""
+import logging
+logger = logging.getLogger(__name__)
+import mmap
+from .compat import text_type
+
+
+class ChoiceIndex(object):
+    """hashed choices, membership check is O(1). the order of choices is kept for error messages"""
+    def __init__(self, choices):
+        self.choices = tuple(choices)
+        self._index = frozenset(self.choices)
+
+    def __contains__(self, value):
+        try:
+            return value in self._index
+        except TypeError:  # unhashable value
+            return False
+
+    def issuperset(self, values):
+        try:
+            return self._index.issuperset(values)
+        except TypeError:
+            return False
+
+    def __iter__(self):
+        return iter(self.choices)
+
+    def __len__(self):
+        return len(self.choices)
+
+    def __repr__(self):
+        return "<ChoiceIndex size={}>".format(len(self.choices))
+
+    @classmethod
+    def from_file(cls, path, encoding="utf-8"):
+        return MappedChoiceIndex(path, encoding=encoding)
+
+
+class MappedChoiceIndex(object):
+    """choices in a memory-mapped file, one choice per line, sorted by bytes (e.g. `LC_ALL=C sort`).
+
+    membership check is a binary search on the file, O(log n), the file is not loaded into memory.
+    """
+    def __init__(self, path, encoding="utf-8"):
+        self.path = path
+        self.encoding = encoding
+        with open(path, "rb") as rf:
+            try:
+                self._mm = mmap.mmap(rf.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # empty file
+                self._mm = b""
+
+    def _key(self, value):
+        if isinstance(value, bytes):
+            return value
+        return text_type(value).encode(self.encoding)
+
+    def __contains__(self, value):
+        key = self._key(value)
+        if b"\n" in key:
+            return False
+        mm = self._mm
+        lo, hi = 0, len(mm)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = mm.rfind(b"\n", lo, mid) + 1 or lo
+            end = mm.find(b"\n", start, hi)
+            if end < 0:
+                end = hi
+            line = mm[start:end]
+            if line == key:
+                return True
+            elif line < key:
+                lo = end + 1
+            else:
+                hi = start
+        return False
+
+    def issuperset(self, values):
+        return all(v in self for v in values)
+
+    def __iter__(self):
+        start, size = 0, len(self._mm)
+        while start < size:
+            end = self._mm.find(b"\n", start)
+            if end < 0:
+                end = size
+            if end > start:
+                yield self._mm[start:end].decode(self.encoding)
+            start = end + 1
+
+    def __repr__(self):
+        return "<MappedChoiceIndex path={!r}>".format(self.path)
+
+    def __reduce__(self):
+        return (self.__class__, (self.path, self.encoding))
+
+
+def as_choice_index(choices):
+    """ChoiceIndex of choices. if choices are unhashable, choices are returned as is"""
+    if isinstance(choices, (ChoiceIndex, MappedChoiceIndex)):
+        return choices
+    try:
+        return ChoiceIndex(choices)
+    except TypeError:
+        return choices
@@ -0,0 +1,197 @@
+# -*- coding:utf-8 -*-
+"""
+columnar validation (requires numpy)
+
+dict of equal-length columns -> validated columns + failed rows
+"""
+import logging
+logger = logging.getLogger(__name__)
+from collections import (
+    defaultdict,
+    OrderedDict
+)
+import numpy as np
+from . import (
+    translator_for,
+    collect_error,
+    ValidationError,
+    Break,
+    Range,
+    reject_None,
+    parse_int,
+    parse_float,
+    positive
+)
+
+
+class ColumnarResult(object):
+    def __init__(self, columns, mask, errors):
+        self.columns = columns
+        self.mask = mask
+        self.errors = errors
+
+    @property
+    def failed(self):
+        return np.flatnonzero(self.mask)
+
+    def __repr__(self):
+        return "<ColumnarResult rows={} failed={}>".format(len(self.mask), len(self.errors))
+
+
+def _cast(dtype):
+    def cast(cnv, arr, active, options):
+        out = np.zeros(len(arr), dtype=dtype)
+        bad = np.zeros(len(arr), dtype=bool)
+        sub = arr[active]
+        if sub.dtype.kind == "f" and dtype is np.int64:
+            bad[active] = ~np.isfinite(sub)
+            if bad.any():
+                return _elementwise(cnv, arr, active, options)
+        try:
+            out[active] = sub.astype(dtype)
+        except (ValueError, TypeError, OverflowError):
+            return _elementwise(cnv, arr, active, options)
+        return out, bad
+    return cast
+
+
+def _compare(predicate):
+    def compare(cnv, arr, active, options):
+        bad = np.zeros(len(arr), dtype=bool)
+        try:
+            bad[active] = predicate(cnv, arr[active])
+        except TypeError:
+            return _elementwise(cnv, arr, active, options)
+        return arr, bad
+    return compare
+
+
+vectorized = {
+    parse_int: _cast(np.int64),
+    parse_float: _cast(np.float64),
+    positive: _compare(lambda cnv, arr: arr < 0),
+    Range: _compare(lambda cnv, arr: (arr < cnv.min) | (arr > cnv.max)),
+}
+
+
+def register_vectorized(convertor, fn):
+    """fn(convertor, array, active_mask, options) -> (converted_array, failed_mask)"""
+    vectorized[convertor] = fn
+
+
+def lookup_vectorized(convertor):
+    try:
+        return vectorized.get(convertor) or vectorized.get(convertor.__class__)
+    except TypeError:  # unhashable convertor
+        return vectorized.get(convertor.__class__)
+
+
+def _elementwise(cnv, arr, active, options):
+    out = np.empty(len(arr), dtype=object)
+    out[:] = arr
+    bad = np.zeros(len(arr), dtype=bool)
+    for i in np.flatnonzero(active):
+        try:
+            out[i] = cnv(arr[i], options)
+        except Break as e:
+            out[i] = e.value
+        except Exception:
+            bad[i] = True
+    return out, bad
+
+
+def _isnone(arr):
+    if arr.dtype != object:
+        return np.zeros(len(arr), dtype=bool)
+    return np.frompyfunc(lambda v: v is None, 1, 1)(arr).astype(bool)
+
+
+def _as_array(values, n):
+    if values is None:
+        arr = np.empty(n, dtype=object)
+        arr[:] = None
+        return arr
+    arr = np.asarray(values)
+    if arr.ndim != 1:
+        arr = np.empty(len(values), dtype=object)
+        arr[:] = list(values)
+    return arr
+
+
+def _collect_row_errors(errors, name, cnv, arr, bad, options, translate):
+    # failed rows are few, so messages are produced by the original convertor
+    for i in np.flatnonzero(bad):
+        i = int(i)
+        try:
+            cnv(arr[i], options)
+            e = ValidationError(None, name=name, message=None)
+        except ValidationError as e_:
+            e = e_
+            e.name = name
+        except Exception as e_:
+            e = ValidationError(e_, name=name)
+        collect_error(errors[i], e, translate)
+
+
+def _validate_column(name, arr, convertors, options, errors, translate):
+    n = len(arr)
+    alive = np.ones(n, dtype=bool)
+    defaulted = np.zeros(n, dtype=bool)
+    for cnv in convertors:
+        active = alive & ~defaulted
+        if not active.any():
+            break
+        if cnv is reject_None:
+            isnone = _isnone(arr) & active
+            if options.get("required", True):
+                _collect_row_errors(errors, name, cnv, arr, isnone, options, translate)
+                alive &= ~isnone
+            else:
+                defaulted |= isnone
+            continue
+
+        fn = lookup_vectorized(cnv)
+        if fn is None:
+            converted, bad = _elementwise(cnv, arr, active, options)
+        else:
+            converted, bad = fn(cnv, arr, active, options)
+        bad &= active
+        if bad.any():
+            _collect_row_errors(errors, name, cnv, arr, bad, options, translate)
+            alive &= ~bad
+        arr = converted
+
+    if defaulted.any():
+        result = np.empty(n, dtype=object)
+        result[:] = arr
+        result[defaulted] = options.get("default")
+        return result
+    return arr
+
+
+def validate_columns(schema, columns, locale=None):
+    """validate columns (dict of equal-length arrays or lists keyed by schema.fieldnames)
+
+    only flat schemas are supported. known convertors (parse_int, parse_float, positive, Range, ...)
+    are applied as array operations, others are applied per element.
+    """
+    lengths = set(len(columns[name]) for name in schema.fieldnames if columns.get(name) is not None)
+    if len(lengths) > 1:
+        raise ValueError("columns must have the same length: {}".format(sorted(lengths)))
+    n = lengths.pop() if lengths else 0
+
+    translate = translator_for(locale)
+    errors = defaultdict(lambda: defaultdict(list))
+    validated = OrderedDict()
+    for name in schema.fieldnames:
+        plan = schema._fieldplans[name]
+        if plan is None:
+            raise ValueError("columnar validation supports only atom fields: {}.{}".format(schema.__name__, name))
+        convertors, options = plan
+        arr = _as_array(columns.get(name), n)
+        validated[name] = _validate_column(name, arr, convertors, options, errors, translate)
+
+    mask = np.zeros(n, dtype=bool)
+    if errors:
+        mask[sorted(errors)] = True
+    return ColumnarResult(validated, mask, dict(errors))
@@ -2,9 +2,19 @@
 import logging
 logger = logging.getLogger(__name__)
 import sys
+import inspect
+import itertools
 from functools import partial
+from operator import itemgetter
 from collections import defaultdict
-from . import Failure
+from . import (
+    Failure,
+    ErrorTree,
+    insert_error,
+    as_json_errors,
+    validate_schema,
+    _Profiling
+)
 
 
 def is_validator(v):
@@ -12,12 +22,12 @@ def is_validator(v):
 
 
 class Counter(object):
+    """thread safe, next() of itertools.count is atomic"""
     def __init__(self):
-        self.i = 0
+        self._count = itertools.count(1)
 
     def __call__(self):
-        self.i += 1
-        return self.i
+        return next(self._count)
 
 counter = Counter()
 
@@ -62,7 +72,18 @@ class Convert(object):
                 return self.method(parent, params)
 
 
+def _child_position(prefix, child, e):
+    """position of e raised by child, under prefix (e.g. ["ps", 0])"""
+    position = getattr(e, "position", None)  # Exception can be overridden, e.g. ValueError
+    if isinstance(child, (Container, Collection)):
+        return prefix + list(position or ())
+    elif position is None:
+        return prefix + [getattr(child, "position", None) or child.names[0]]
+    return position
+
+
 class Container(object):
+    """no state is kept while running, so an instance can be shared between threads"""
     def __init__(self, name, cls):
         self.names = [name]  # for common interface
         self.name = name
@@ -71,24 +92,19 @@ class Container(object):
         self._v_count = counter()
         self.msg = None
 
-        self.child = None
-
     def __call__(self, parent, params):
         if self.name in params:
             target = params[self.name]
             for v in self.validators:
-                self.child = v
-                v(parent, target)
-
-    @property
-    def position(self):
-        r = [self.name]
-        if self.child:
-            r.append(getattr(self.child, "position") or self.child.names[0])
-        return r
+                try:
+                    v(parent, target)
+                except (parent.Exception, parent.Interrupt) as e:
+                    e.position = _child_position([self.name], v, e)
+                    raise
 
 
 class Collection(object):
+    """no state is kept while running, so an instance can be shared between threads"""
     def __init__(self, name, cls):
         self.names = [name]  # for common interface
         self.name = name
@@ -97,25 +113,16 @@ class Collection(object):
         self._v_count = counter()
         self.msg = None
 
-        self.index = None
-        self.child = None
-
     def __call__(self, parent, params):
         if self.name in params:
             targets = params[self.name]
             for i, target in enumerate(targets):
                 for v in self.validators:
-                    self.index = i
-                    self.child = v
-                    v(parent, target)
-
-    @property
-    def position(self):
-        r = [self.name]
-        if self.child:
-            r.append(self.index)
-            r.append(getattr(self.child, "position") or self.child.names[0])
-        return r
+                    try:
+                        v(parent, target)
+                    except (parent.Exception, parent.Interrupt) as e:
+                        e.position = _child_position([self.name, i], v, e)
+                        raise
 
 
 def single(name, msg=None):
@@ -170,43 +177,227 @@ class Interrupt(Exception):
         self.position = position
 
 
+_ALL, _ANY, _ALWAYS = 0, 1, 2
+
+
+def _requirement_of(v):
+    """(names, mode). the validator is run when all (or any) of names are not None in params"""
+    if isinstance(v, Matched):
+        return frozenset(v.names), _ANY
+    if isinstance(v, (Multi, Container, Collection)) or (isinstance(v, Convert) and v.names):
+        return frozenset(v.names), _ALL
+    return frozenset(), _ALWAYS  # Convert without names, or unknown validators
+
+
+def _runner_of(v):
+    """a function same as v(parent, params), called only when the requirement of v is satisfied"""
+    if v.__class__ is Multi:
+        method = v.method
+        if len(v.names) == 1:
+            name = v.names[0]
+            return lambda parent, params: method(parent, params[name])
+        getter = itemgetter(*v.names)
+        return lambda parent, params: method(parent, *getter(params))
+    if v.__class__ is Convert and v.names:
+        return v.method
+    return v
+
+
+class _Plan(object):
+    """validators indexed by field name. selected validators are cached by the set of present names"""
+    maxsize = 256
+
+    def __init__(self, validators):
+        self.entries = [(v, ) + _requirement_of(v) + (_runner_of(v), ) for v in validators]
+        self.index = defaultdict(list)
+        self.always = []
+        for i, (v, names, mode, _) in enumerate(self.entries):
+            if mode == _ALWAYS:
+                self.always.append(i)
+            for name in names:
+                self.index[name].append(i)
+        self._selected = {}
+
+    def select(self, params, fields=None):
+        """[(validator, runner)] to run for params. if fields is given, only validators depending on them"""
+        present = frozenset(k for k, v in params.items() if v is not None)
+        key = (present, fields)
+        try:
+            return self._selected[key]
+        except KeyError:
+            pass
+        if fields is None:
+            positions = range(len(self.entries))
+        else:
+            positions = sorted(set(self.always).union(*(self.index.get(name, ()) for name in fields)))
+        selected = []
+        dynamic = False
+        for i in positions:
+            v, names, mode, run = self.entries[i]
+            if dynamic:  # params can be changed by Convert, so v checks them at call time
+                selected.append((v, v))
+                continue
+            if mode == _ALL and not names.issubset(present):
+                continue
+            if mode == _ANY and names.isdisjoint(present):
+                continue
+            selected.append((v, run))
+            dynamic = mode == _ALWAYS or isinstance(v, Convert)
+        if len(self._selected) >= self.maxsize:
+            self._selected.clear()
+        self._selected[key] = selected
+        return selected
+
+
 class ValidationObjectMeta(type):
     def __new__(self, name, bases, attrs):
         validators = [v for v in attrs.values() if is_validator(v)]
         validators.sort(key=lambda o: o._v_count)
         attrs["validators"] = validators
+        plan = attrs["_plan"] = _Plan(validators)
+        attrs["field_index"] = {k: [validators[i] for i in positions] for k, positions in plan.index.items()}
 
-        def __call__(self, ob):
-            status = True
-            params, errors = self.configure(ob)
-            if errors:
-                return self.on_failure(ob, params, errors)
+        def __call__(self, ob, max_errors=None, locale=None, fields=None):
+            if fields is not None:
+                fields = frozenset(fields)
+            if _Profiling.profiler is not None:
+                return _Profiling.profiler.call_object(self, _validate_object, ob, max_errors, locale, fields=fields)
+            return _validate_object(self, ob, max_errors, locale, fields=fields)
 
+        attrs["__call__"] = __call__
+        attrs["validate"] = __call__
+        cls = super().__new__(self, name, bases, attrs)
+        configure = getattr(cls, "configure", None)
+        cls._configure_options = configure is not None and _accepts_options(configure)
+        return cls
+
+
+def _accepts_options(fn):
+    """configure(schema, max_errors=..., locale=...) or the older configure(schema)"""
+    try:
+        parameters = inspect.signature(fn).parameters.values()
+    except (TypeError, ValueError):
+        return True
+    names = {p.name for p in parameters}
+    return ("max_errors" in names and "locale" in names) or any(p.kind == p.VAR_KEYWORD for p in parameters)
+
+
+def _configure(self, ob, max_errors=None, locale=None):
+    if self._configure_options:
+        return self.configure(ob, max_errors=max_errors, locale=locale)
+    return self.configure(ob)
+
+
+def _is_pure(v):
+    """validators only checking params. (Convert can modify params)"""
+    if isinstance(v, (Multi, Matched)):
+        return True
+    if isinstance(v, (Container, Collection)):
+        return all(_is_pure(child) for child in v.validators)
+    return False
+
+
+def _same(xs, ys):
+    return all(x is y or (x.__class__ is y.__class__ and x == y) for x, y in zip(xs, ys))
+
+
+def _copied_state(state):
+    position = state.get("position")
+    if isinstance(position, list):
+        state = dict(state, position=list(position))  # positions are extended by parents
+    return state
+
+
+def _reuse_outcome(self, v, params, outcomes):
+    """inputs of v. if v has run for the same inputs, the previous outcome is reused (a failure is raised again)"""
+    inputs = [params.get(name) for name in v.names]
+    previous = outcomes.get(v)
+    if previous is not None and _same(previous[0], inputs):
+        if previous[1] is not None:
+            # a new exception, re-raising the cached one would grow its traceback (holding frames) each time.
+            # __init__ is not called, so any signature of the exception class is fine
+            cls, args, state = previous[1]
+            e = cls.__new__(cls, *args)
+            e.args = args
+            e.__dict__.update(_copied_state(state))
+            raise e
+        return None
+    return inputs
+
+
+def _store_outcome(self, v, inputs, outcomes, e=None):
+    if e is None:
+        outcomes[v] = (inputs, None)
+        return
+    outcomes[v] = (inputs, (e.__class__, e.args, _copied_state(getattr(e, "__dict__", {}))))
+
+
+def _call_incremental(self, v, params, profiler, outcomes):
+    """run v, or reuse the outcome of the previous run for the same params of v"""
+    inputs = _reuse_outcome(self, v, params, outcomes)
+    if inputs is None:
+        return
+    try:
+        if profiler is None:
+            v(self, params)
+        else:
+            profiler.call_validator(self, v, params)
+    except (self.Exception, self.Interrupt) as e:
+        _store_outcome(self, v, inputs, outcomes, e)
+        raise
+    _store_outcome(self, v, inputs, outcomes)
+
+
+def _outcomes_of(self, ob):
+    """stored outcomes of validators for the schema instance, None if self is not incremental"""
+    if self.incremental and hasattr(ob, "__dict__"):
+        return ob.__dict__.setdefault("_outcomes", {}).setdefault(self, {})
+    return None
+
+
+def _validate_object(self, ob, max_errors=None, locale=None, profiler=None, fields=None):
+    if max_errors is None:
+        max_errors = self.max_errors
+    status = True
+    params, errors = _configure(self, ob, max_errors=max_errors, locale=locale)
+    if errors:
+        return self.on_failure(ob, params, errors)
+
+    outcomes = _outcomes_of(self, ob)
+
+    n_errors = 0
+    try:
+        for v, run in self._plan.select(params, fields):
             try:
-                for v in self.validators:
-                    try:
-                        v(self, params)
-                    except self.Exception as e:
-                        self.catch_error(params, errors, v, e)
-                        status = False
-            except self.Interrupt as e:
+                if outcomes is not None and _is_pure(v):
+                    _call_incremental(self, v, params, profiler, outcomes)
+                elif profiler is None:
+                    run(self, params)
+                else:
+                    profiler.call_validator(self, v, params)
+            except self.Exception as e:
                 self.catch_error(params, errors, v, e)
-                return self.on_failure(ob, params, errors)
-
-            if status:
-                return self.on_success(ob, params)
-            else:
-                return self.on_failure(ob, params, errors)
+                status = False
+                n_errors += 1
+                if max_errors is not None and n_errors >= max_errors:
+                    break
+    except self.Interrupt as e:
+        self.catch_error(params, errors, v, e)
+        return self.on_failure(ob, params, as_json_errors(errors))
 
-        attrs["__call__"] = __call__
-        attrs["validate"] = __call__
-        return super().__new__(self, name, bases, attrs)
+    if status:
+        return self.on_success(ob, params)
+    else:
+        return self.on_failure(ob, params, as_json_errors(errors))
 
 
 class _ValidationObject(object):
-    def configure(self, schema):
+    max_errors = None  # stop validation when the number of errors reaches it
+    incremental = False  # reuse outcomes of validators whose params are not changed (per schema instance)
+
+    def configure(self, schema, max_errors=None, locale=None):
         try:
-            return schema.validate(), defaultdict(list)
+            return validate_schema(schema, max_errors=max_errors, locale=locale), ErrorTree()
         except Failure as e:
             return {}, e.errors
 
@@ -225,19 +416,11 @@ class _ValidationObject(object):
         if not isinstance(position, (list, tuple)):
             errors[position].append(msg)
         else:
-            target = errors
-            for i, k in enumerate(position[:-1]):
-                if k not in target:
-                    if isinstance(position[i + 1], int):
-                        target[k] = [defaultdict(list) for i in range(position[i + 1] + 1)]
-                    else:
-                        target[k] = defaultdict(list)
-                try:
-                    target = target[k]
-                except IndexError:
-                    for i in range(k + 1):
-                        target[i] = defaultdict(list)
-            target[position[-1]].append(msg)
+            insert_error(errors, position, msg)
+
+    def avalidate(self, ob, concurrency=None, locale=None, max_errors=None, fields=None):
+        from .aio import avalidate_object
+        return avalidate_object(self, ob, concurrency=concurrency, locale=locale, max_errors=max_errors, fields=fields)
 
     def on_success(self, _, params):
         return params
@@ -0,0 +1,114 @@
+# -*- coding:utf-8 -*-
+"""
+validation of large batches with a process pool, and of large Collection fields with an executor.
+
+schema classes must be importable (defined at module level), because they are sent to workers by reference.
+"""
+import logging
+logger = logging.getLogger(__name__)
+import os
+from collections import deque
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
+from . import (
+    _validate_child,
+    Failure,
+    ErrorRecord
+)
+
+
+def _chunked(rows, chunksize):
+    it = iter(rows)
+    while True:
+        chunk = list(islice(it, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _validate_chunk(schema, rows):
+    return schema.validate_many(rows)
+
+
+def iterate_parallel(schema, rows, workers=None, chunksize=1000, initializer=None, initargs=()):
+    """yield validated values or Failure per each row, in input order.
+
+    at most workers * 2 chunks are in flight, so `rows` can be a lazy iterator.
+    workers start with the default translator, use `initializer` (e.g. set_translator) to change it.
+    """
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs) as executor:
+        window = workers * 2
+        pending = deque()
+        for chunk in _chunked(rows, chunksize):
+            pending.append(executor.submit(_validate_chunk, schema, chunk))
+            if len(pending) >= window:
+                for result in pending.popleft().result():
+                    yield result
+        while pending:
+            for result in pending.popleft().result():
+                yield result
+
+
+def validate_parallel(schema, rows, workers=None, chunksize=1000, initializer=None, initargs=()):
+    """same as schema.validate_many(rows), but chunks of rows are validated on a process pool"""
+    return list(iterate_parallel(schema, rows, workers=workers, chunksize=chunksize,
+                                 initializer=initializer, initargs=initargs))
+
+
+def _records_of(failure):
+    if failure.records is not None:
+        return failure.records
+    return [ErrorRecord((k, ), message) for k, messages in failure.errors.items() for message in messages]
+
+
+def _validate_shard(schema, items):
+    results = []
+    for item in items:
+        try:
+            results.append((_validate_child(schema, item), None))
+        except Failure as e:
+            results.append((None, _records_of(e)))
+    return results
+
+
+class CollectionExecutor(object):
+    """validates items of a Collection field in shards on an executor. opt-in per column.
+
+    .. code:: python
+
+        class Upload(t.Schema):
+            rows = t.column(t.Collection(Row), executor=CollectionExecutor(ThreadPoolExecutor(8)))
+
+    use a thread pool for I/O-bound convertors, a process pool for CPU-bound ones.
+    with a process pool, items are validated in workers, so field objects of items are not updated.
+    errors of items are kept per index, e.g. `errors["rows"][10]["x"]`.
+    collections smaller than `threshold` (default: shardsize) are validated in the calling thread.
+    """
+    def __init__(self, executor, shardsize=1000, threshold=None):
+        self.executor = executor
+        self.shardsize = shardsize
+        self.threshold = shardsize if threshold is None else threshold
+
+    def validate_items(self, schema, name, items):
+        """(validated values of items, error records). paths of records are (name, index, ...)"""
+        items = list(items)
+        n = self.shardsize
+        if len(items) < self.threshold:
+            shards = [_validate_shard(schema, items)]
+        else:
+            futures = [self.executor.submit(_validate_shard, schema, items[i:i + n]) for i in range(0, len(items), n)]
+            shards = [future.result() for future in futures]
+
+        values = []
+        records = []
+        index = 0
+        for shard in shards:
+            for validated, found in shard:
+                if found is None:
+                    values.append(validated)
+                else:
+                    values.append(None)
+                    records.extend(ErrorRecord((name, index) + tuple(r.path), r.message, r.error) for r in found)
+                index += 1
+        return values, records
@@ -2,53 +2,459 @@
 """
 x -> dict
 """
+import re
 import json
+import codecs
+from functools import lru_cache
+from . import (
+    Failure,
+    ErrorRecord,
+    _Collection,
+    _subschema_of
+)
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
 
+DECODE_ERROR = "__json__"
 
-def from_json(jsonstring):
-    return json.loads(jsonstring)
 
+class StdlibDecoder(object):
+    """json module. memoryview is copied to bytes"""
+    name = "json"
 
-def from_multidict(multidict):
-    r = [{}]
+    def loads(self, data):
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data)
+
+
+class OrjsonDecoder(object):
+    """orjson (if installed). str, bytes, bytearray and memoryview are decoded without copying"""
+    name = "orjson"
+
+    def loads(self, data):
+        return orjson.loads(data)
+
+
+def create_decoder():
+    if orjson is not None:
+        return OrjsonDecoder()
+    return StdlibDecoder()
+
+
+def set_decoder(new_decoder=None):
+    global decoder
+    decoder = new_decoder or create_decoder()
+
+
+def get_decoder():
+    return decoder
+
+decoder = None
+set_decoder(None)
+
+
+@lru_cache(maxsize=256)
+def _projection_of(schema):
+    r = []
+    for name in schema.fieldnames:
+        sub = _subschema_of(getattr(schema, name))
+        if sub is None:
+            r.append((name, None, None))
+        else:
+            r.append((name, sub[0] is _Collection, sub[1]))
+    return tuple(r)
+
+
+def project(schema, ob):
+    """copy of decoded ob, having only keys declared by schema (and its sub schemas)"""
+    if not isinstance(ob, dict):
+        return ob  # reported by validation
+    r = {}
+    for name, many, sub in _projection_of(schema):
+        if name not in ob:
+            continue
+        v = ob[name]
+        if sub is not None:
+            if not many:
+                v = project(sub, v)
+            elif isinstance(v, list):
+                v = [project(sub, x) for x in v]
+        r[name] = v
+    return r
+
+
+def from_json(data, schema=None):
+    """decode json (str, bytes, bytearray or memoryview), with the decoder (see `set_decoder`).
+
+    if schema is passed, keys not declared by the schema (and its sub schemas) are dropped.
+    (validation ignores them anyway, this is for keeping or passing decoded data)
+    """
+    ob = decoder.loads(data)
+    if schema is None:
+        return ob
+    return project(schema, ob)
+
+
+def iterate_lines(source):
+    """yield (line_no, line) from a file object (text or binary) or an iterator of bytes chunks"""
+    if hasattr(source, "readline"):
+        for line_no, line in enumerate(source, 1):
+            yield line_no, line
+        return
+
+    buf = bytearray()
+    line_no = 0
+    for chunk in source:
+        buf.extend(chunk)
+        start = 0
+        while True:
+            end = buf.find(b"\n", start)
+            if end < 0:
+                break
+            line_no += 1
+            yield line_no, bytes(buf[start:end])
+            start = end + 1
+        del buf[:start]
+    if buf:
+        yield line_no + 1, bytes(buf)
+
+
+def iterate_ndjson(source, loads=None):
+    """yield (line_no, decoded object) for each non-empty line of newline-delimited json"""
+    loads = loads or decoder.loads
+    for line_no, line in iterate_lines(source):
+        if line.strip():
+            yield line_no, loads(line)
+
+
+def decode_ndjson(source, loads=None):
+    """yield (line_no, decoded object or Failure) for each non-empty line of newline-delimited json.
+    a line that is not a json object is reported as Failure (of DECODE_ERROR)
+    """
+    loads = loads or decoder.loads
+    for line_no, line in iterate_lines(source):
+        if not line.strip():
+            continue
+        try:
+            row = loads(line)
+        except ValueError as e:
+            yield line_no, Failure(errors={DECODE_ERROR: [str(e)]})
+            continue
+        if not isinstance(row, dict):
+            yield line_no, Failure(errors={DECODE_ERROR: ["object is expected"]})
+            continue
+        yield line_no, row
+
+
+def validate_ndjson(schema, source, loads=None, locale=None):
+    """yield (line_no, validated values or Failure) for each non-empty line of newline-delimited json.
+
+    lines are read, decoded and validated lazily, a line that is not a json object is also reported as Failure.
+    `loads=partial(from_json, schema=schema)` drops undeclared keys after decoding.
+    """
+    validate_dict = schema._validate_dict
+    for line_no, row in decode_ndjson(source, loads=loads):
+        if isinstance(row, Failure):
+            yield line_no, row
+            continue
+        try:
+            values, records = validate_dict(row)
+        except Failure as e:  # from nested schema
+            yield line_no, e
+            continue
+        yield line_no, (Failure(records=records, locale=locale) if records else values)
+
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_NUMBER_CHARS = re.compile(r"[0-9.eE+\-]*")
+
+
+class JSONArrayReader(object):
+    """items of a json array, decoded incrementally from a file object (text or binary) or an iterator of chunks.
+
+    with `key`, the source is an object and the array of the key is read. other members of the object are
+    stored to `rest` (members after the array are available after the iteration). without `key`, the
+    source is an array. only one item is held in memory at a time.
+    """
+    def __init__(self, source, key=None, chunksize=65536):
+        if hasattr(source, "read"):
+            self.chunks = iter(lambda: source.read(chunksize), source.read(0))
+        else:
+            self.chunks = iter(source)
+        self.key = key
+        self.rest = {}
+        self.found = False
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        decoder = json.JSONDecoder()
+        self._scan = decoder.raw_decode
+        self._scan_once = decoder.scan_once
+        self.buf = ""
+        self.pos = 0
+        self.offset = 0  # position of buf in the whole source
+        self.eof = False
+
+    def _fill(self):
+        chunk = next(self.chunks, None)
+        if chunk is None:
+            self.eof = True
+            chunk = self._decoder.decode(b"", final=True)
+        elif not isinstance(chunk, str):
+            chunk = self._decoder.decode(chunk)
+        self.offset += self.pos
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+
+    def _skip(self):
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf) or self.eof:
+                return
+            self._fill()
+
+    def _next_char(self):
+        self._skip()
+        if self.pos >= len(self.buf):
+            raise ValueError("unexpected end of json at {}".format(self.offset + self.pos))
+        c = self.buf[self.pos]
+        self.pos += 1
+        return c
+
+    def _expect(self, chars):
+        c = self._next_char()
+        if c not in chars:
+            raise ValueError("{!r} is expected at {}, but {!r}".format(chars, self.offset + self.pos - 1, c))
+        return c
+
+    def _peek(self):
+        self._skip()
+        return self.buf[self.pos:self.pos + 1]
+
+    def _value(self):
+        while True:
+            self._skip()
+            try:
+                ob, end = self._scan(self.buf, self.pos)
+            except ValueError:
+                if self.eof:
+                    raise
+                self._fill()
+                continue
+            if not self.eof and _NUMBER_CHARS.match(self.buf, end).end() == len(self.buf):  # maybe truncated number
+                self._fill()
+                continue
+            self.pos = end
+            return ob
+
+    def _items(self):
+        self._expect("[")
+        if self._peek() == "]":
+            self.pos += 1
+            return
+        scan_once = self._scan_once
+        skip = _WHITESPACE.match
+        while True:
+            # fast path: items followed by a separator in the buffer
+            buf, pos, n = self.buf, self.pos, len(self.buf)
+            while True:
+                try:
+                    ob, end = scan_once(buf, skip(buf, pos).end())
+                except (StopIteration, ValueError):
+                    break
+                sep = skip(buf, end).end()
+                if sep >= n or buf[sep] not in ",]":
+                    break
+                pos = self.pos = sep + 1
+                yield ob
+                if buf[sep] == "]":
+                    return
+            # slow path: an item over chunks
+            yield self._value()
+            if self._expect(",]") == "]":
+                return
+
+    def __iter__(self):
+        if self.key is None:
+            yield from self._items()
+            return
+
+        self._expect("{")
+        if self._peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            k = self._value()
+            self._expect(":")
+            if k == self.key and not self.found:
+                self.found = True
+                yield from self._items()
+            else:
+                self.rest[k] = self._value()
+            if self._expect(",}") == "}":
+                return
+
+
+class MultiDictError(ValueError):
+    """invalid keys of form data (mixed structures, or over the limits)"""
+
+
+_BRACKETED = re.compile(r"^([^\[\]]+)((?:\[[^\[\]]*\])+)$")
+
+
+class _Nested(dict):
+    __slots__ = ("nested", )
+
+    def __init__(self):
+        self.nested = False  # having _Nested or _Indexed as a value
+
+
+class _Indexed(dict):
+    """index -> value, converted to a list ordered by index"""
+    __slots__ = ("nested", "next")
+
+    def __init__(self):
+        self.nested = False
+        self.next = 0
+
+
+def _segments(k, max_depth):
+    m = _BRACKETED.match(k)
+    if m is None:
+        return None
+    segments = m.group(2)[1:-1].split("][")
+    if len(segments) > max_depth:
+        raise MultiDictError("{!r} is too deep (max_depth={})".format(k, max_depth))
+    for seg in segments[:-1]:
+        if not seg:
+            raise MultiDictError("{!r}: [] is only allowed at the end".format(k))
+    return m.group(1), segments
+
+
+def _store(root, k, name, segments, values, max_index):
+    node, key = root, name
+    for seg in segments:
+        expected = _Indexed if (not seg or seg.isdigit()) else _Nested
+        child = node.get(key)
+        if child is None:
+            child = node[key] = expected()
+            node.nested = True
+        elif child.__class__ is not expected:
+            raise MultiDictError("{!r} conflicts with other keys".format(k))
+        node = child
+        if expected is _Nested:
+            key = seg
+            continue
+        if not seg:  # appending, always at the end
+            if node.next + len(values) - 1 > max_index:
+                raise MultiDictError("{!r}: too many values (max_index={})".format(k, max_index))
+            node.update(zip(range(node.next, node.next + len(values)), values))
+            node.next += len(values)
+            return
+        key = int(seg)
+        if key > max_index:
+            raise MultiDictError("{!r}: index is too large (max_index={})".format(k, max_index))
+        if key >= node.next:
+            node.next = key + 1
+    if isinstance(node.get(key), (_Nested, _Indexed)):
+        raise MultiDictError("{!r} conflicts with other keys".format(k))
+    node[key] = values[-1]
+
+
+def _iterate_lists(multidict, getter):
+    """(key, values) of multidict, in order of first appearance"""
+    if hasattr(multidict, "lists"):  # django, werkzeug
+        return multidict.lists()
+    if hasattr(multidict, "getall"):  # webob, aiohttp. items() includes all values
+        grouped = {}
+        for k, v in multidict.items():
+            try:
+                grouped[k].append(v)
+            except KeyError:
+                grouped[k] = [v]
+        return grouped.items()
+    return ((k, getter(k)) for k in dict.fromkeys(multidict.keys()))
+
+
+def _finalize(node, indexes=None, path=()):
+    if node.__class__ is _Indexed:
+        if len(node) == node.next:  # without holes
+            keys = range(node.next)
+        else:
+            keys = sorted(node)
+            if indexes is not None:
+                indexes[path] = keys
+        values = list(map(node.__getitem__, keys))
+        if node.nested:
+            values = [_finalize(v, indexes, path + (i, )) if isinstance(v, (_Nested, _Indexed)) else v
+                      for i, v in enumerate(values)]
+        return values
+    if node.nested:
+        return {k: (_finalize(v, indexes, path + (k, )) if isinstance(v, (_Nested, _Indexed)) else v)
+                for k, v in node.items()}
+    return dict(node)
+
+
+def _restore_path(path, indexes):
+    restored = list(path)
+    for n, k in enumerate(path):
+        original = indexes.get(tuple(path[:n]))
+        if original is not None and isinstance(k, int) and 0 <= k < len(original):
+            restored[n] = original[k]
+    return tuple(restored)
+
+
+def restore_indexes(failure, indexes):
+    """failure of data from `from_multidict(..., indexes=indexes)` -> failure with indexes of lists as posted.
+
+    e.g. errors of `p[1][x]=a&p[3][x]=b` are at p[0] and p[1], and restored to p[1] and p[3].
+    a failure without records (created with errors) is returned as is.
+    """
+    if not indexes or failure.records is None:
+        return failure
+    records = [ErrorRecord(_restore_path(r.path, indexes), r.message, r.error) for r in failure.records]
+    return failure.__class__(locale=failure.locale, records=records)
+
+
+def from_multidict(multidict, max_depth=8, max_index=10000, indexes=None):
+    """form data (multidict) -> dict, or list of dicts if plain keys are repeated.
+
+    bracketed keys are converted to nested structure, e.g. `points[0][x]=1&tags[]=a&tags[]=b`
+    -> {"points": [{"x": "1"}], "tags": ["a", "b"]}.
+
+    indexes are ordered, but holes are removed, e.g. `p[1][x]=1&p[3][x]=3` -> {"p": [{"x": "1"}, {"x": "3"}]},
+    so indexes of validation errors refer to the compacted list (errors["p"][0] is of p[1]).
+    if indexes (a dict) is passed, posted indexes of compacted lists are stored in it, by path of the list
+    (e.g. {("p", ): [1, 3]}), and `restore_indexes(failure, indexes)` converts errors to the posted indexes.
+    """
     try:
         getter = getattr(multidict, "getall", None) or getattr(multidict, "getlist")
     except AttributeError:
         return multidict  # maybe dict
 
-    used = {}
-    use_php_compatible_flow = False
-    for k in multidict.keys():
-        if k in used:
+    rows = [{}]
+    nested = _Nested()
+    for k, values in _iterate_lists(multidict, getter):
+        parsed = _segments(k, max_depth) if "[" in k else None
+        if parsed is not None:
+            _store(nested, k, parsed[0], parsed[1], values, max_index)
             continue
-        used[k] = 1
+        if len(values) > len(rows):
+            rows.extend({} for _ in range(len(values) - len(rows)))
+        for row, v in zip(rows, values):
+            row[k] = v
 
-        if k.endswith("[]"):  # php compatible
-            store_k = k[:-2]
-            use_php_compatible_flow = True
-            for i, v in enumerate(getter(k)):
-                try:
-                    r[0][store_k].append(v)
-                except IndexError:
-                    r.append({})
-                    r[0].setdefault(store_k, [])
-                    r[0][store_k].append(v)
-                except KeyError:
-                    r[0].setdefault(store_k, [])
-                    r[0][store_k].append(v)
-        else:
-            store_k = k
-            for i, v in enumerate(getter(k)):
-                try:
-                    r[i][store_k] = v
-                except IndexError:
-                    r.append({})
-                    r[i][store_k] = v
-    if len(r) <= 1:
-        return r[0]
-    if use_php_compatible_flow:
-        raise Exception("something wrong")
-    return r
+    if nested:
+        if len(rows) > 1:
+            raise MultiDictError("bracketed keys cannot be used with repeated keys: {}".format(sorted(nested)))
+        for k in nested:
+            if k in rows[0]:
+                raise MultiDictError("{!r} conflicts with bracketed keys".format(k))
+        rows[0].update(_finalize(nested, indexes))
+    if len(rows) <= 1:
+        return rows[0]
+    return rows
 
 
 class DjangoMultiDictWrapper(object):
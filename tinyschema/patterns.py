@@ -0,0 +1,61 @@
+# -*- coding:utf-8 -*-
+"""
+compiled patterns for Regex validators. patterns are compiled once and shared between validators.
+"""
+import logging
+logger = logging.getLogger(__name__)
+import re
+from functools import lru_cache
+try:
+    import regex
+except ImportError:  # pragma: no cover
+    regex = None
+
+
+@lru_cache(maxsize=256)
+def compile_pattern(rx, flags=0):
+    return re.compile(rx, flags)
+
+
+@lru_cache(maxsize=256)
+def compile_timeboxed(rx, flags=0):
+    """pattern of the regex module (if installed), its matching can be time-boxed"""
+    if regex is None:
+        raise RuntimeError("time-boxed matching requires the regex module (pip install tinyschema[regex])")
+    return regex.compile(rx, flags)
+
+
+def match_timeboxed(pattern, val, timeout):
+    """match object, or None (also when matching takes more than timeout seconds)"""
+    try:
+        return pattern.match(val, timeout=timeout)
+    except TimeoutError:
+        logger.info("matching %r is timed out (%s sec)", pattern.pattern, timeout)
+        return None
+
+
+class Prefilter(object):
+    """cheap checks before the full match. a rejected value is not matched at all.
+
+    - max_length -- values longer than this are rejected. this bounds the matching time only if the pattern
+      is already linear (e.g. URL_REGEX). for backtracking patterns (e.g. `^(a+)+$`), use Regex(timeout=...)
+    - contains -- all of these substrings are required
+    - prefixes -- one of these prefixes is required
+    """
+    def __init__(self, max_length=None, contains=(), prefixes=()):
+        self.max_length = max_length
+        self.contains = tuple(contains)
+        self.prefixes = tuple(prefixes)
+
+    def __call__(self, val):
+        if self.max_length is not None and len(val) > self.max_length:
+            return False
+        for s in self.contains:
+            if s not in val:
+                return False
+        if self.prefixes and not val.startswith(self.prefixes):
+            return False
+        return True
+
+    def __repr__(self):
+        return "<Prefilter max_length={} contains={} prefixes={}>".format(self.max_length, self.contains, self.prefixes)
@@ -0,0 +1,245 @@
+# -*- coding:utf-8 -*-
+"""
+opt-in profiling of validation. calls, time and failures are recorded per schema, field, convertor
+and validator (of ValidationObject), and passed to sinks.
+
+a sink is a callable, `sink(kind, key, elapsed, failed)`. kind is one of "schema", "field", "convertor",
+"object" and "validator". e.g. ("convertor", "Point.x:parse_int", 0.0001, True)
+
+.. code:: python
+
+    from tinyschema import profiling
+
+    sink = profiling.MemorySink()
+    with profiling.profiling(sink):
+        Point(x="10", y="20").validate()
+    print(sink.stats)
+
+when profiling is disabled, validation is not changed (only a check of the active profiler is added).
+"""
+import logging
+logger = logging.getLogger(__name__)
+import re
+import socket
+from time import perf_counter
+from functools import partial
+from contextlib import contextmanager
+from collections import OrderedDict
+from . import (
+    _Profiling,
+    _Field,
+    _Container,
+    _Collection,
+    compile_validate_dict,
+    Break,
+    ValidationError,
+    Failure,
+    ErrorRecord
+)
+
+
+def _name_of(ob):
+    if isinstance(ob, partial):
+        ob = ob.func
+    return getattr(ob, "__name__", None) or ob.__class__.__name__
+
+
+class Stats(object):
+    __slots__ = ("calls", "failures", "time")
+
+    def __init__(self):
+        self.calls = 0
+        self.failures = 0
+        self.time = 0.0
+
+    def __repr__(self):
+        return "<Stats calls={} failures={} time={:.6f}>".format(self.calls, self.failures, self.time)
+
+
+class MemorySink(object):
+    """aggregates records in memory. `stats` is a dict of (kind, key) -> Stats"""
+    def __init__(self):
+        self.stats = {}
+
+    def __call__(self, kind, key, elapsed, failed):
+        try:
+            stats = self.stats[(kind, key)]
+        except KeyError:
+            stats = self.stats[(kind, key)] = Stats()
+        stats.calls += 1
+        stats.time += elapsed
+        if failed:
+            stats.failures += 1
+
+    def reset(self):
+        self.stats = {}
+
+
+class StatsdSink(object):
+    """sends records as statsd metrics over UDP, e.g. `tinyschema.field.Point.x.calls:1|c`"""
+    _invalid = re.compile(r"[^A-Za-z0-9_.\-]")
+
+    def __init__(self, host="127.0.0.1", port=8125, prefix="tinyschema"):
+        self.address = (host, port)
+        self.prefix = prefix
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._names = {}
+
+    def _metric(self, kind, key):
+        try:
+            return self._names[(kind, key)]
+        except KeyError:
+            name = self._names[(kind, key)] = "{}.{}.{}".format(self.prefix, kind, self._invalid.sub("_", key))
+            return name
+
+    def __call__(self, kind, key, elapsed, failed):
+        name = self._metric(kind, key)
+        lines = ["{}.calls:1|c".format(name), "{}.time:{:.3f}|ms".format(name, elapsed * 1000)]
+        if failed:
+            lines.append("{}.failures:1|c".format(name))
+        try:
+            self.socket.sendto("\n".join(lines).encode("ascii"), self.address)
+        except OSError as e:
+            logger.debug("statsd: %s", e)
+
+    def close(self):
+        self.socket.close()
+
+
+class Profiler(object):
+    """instrumented validation, used instead of the usual one while the profiler is active"""
+    def __init__(self, *sinks):
+        self.sinks = list(sinks)
+
+    def record(self, kind, key, elapsed, failed):
+        for sink in self.sinks:
+            sink(kind, key, elapsed, failed)
+
+    def _call_convertor(self, key, cnv, value, options):
+        start = perf_counter()
+        failed = True
+        try:
+            value = cnv(value, options)
+            failed = False
+            return value
+        except Break:
+            failed = False
+            raise
+        finally:
+            self.record("convertor", "{}:{}".format(key, _name_of(cnv)), perf_counter() - start, failed)
+
+    def _run_chain(self, key, value, convertors, options):
+        start = perf_counter()
+        failed = True
+        try:
+            try:
+                for cnv in convertors:
+                    value = self._call_convertor(key, cnv, value, options)
+            except Break as e:
+                value = e.value
+            failed = False
+            return value
+        finally:
+            self.record("field", key, perf_counter() - start, failed)
+
+    def validate_field(self, field, prefix=None):
+        """same as field.validate(). key of the field is "<prefix>.<name>" (or "<name>")"""
+        name = field._options.get("name")
+        key = name if prefix is None else "{}.{}".format(prefix, name)
+        try:
+            return self._run_chain(key, field.value, field.convertors, field._options)
+        except ValidationError as e:
+            e.name = name
+            raise
+        except Exception as e:
+            raise ValidationError(e, name=name)
+
+    def validate_schema(self, ob, max_errors=None, locale=None):
+        """same as ob.validate()"""
+        cls = ob.__class__
+        start = perf_counter()
+        records = []
+        values = OrderedDict()
+        try:
+            for name in cls.fieldnames:
+                current = getattr(ob, name)
+                try:
+                    current.raw = current.value
+                    if isinstance(current, _Field):
+                        validated = self.validate_field(current, cls.__name__)
+                    elif isinstance(current, (_Container, _Collection)):
+                        budget = None if max_errors is None else max_errors - len(records)
+                        validated = current.validate(max_errors=budget, locale=locale)
+                    else:
+                        validated = current.validate()
+                    values[name] = validated
+                    current.renewal(validated)
+                except ValidationError as e:
+                    records.append(ErrorRecord.from_error(e))
+                    if max_errors is not None and len(records) >= max_errors:
+                        raise Failure(records=records, locale=locale)
+            if records:
+                raise Failure(records=records, locale=locale)
+            return values
+        finally:
+            self.record("schema", cls.__name__, perf_counter() - start, bool(records))
+
+    def validate_dict(self, cls, data):
+        """same as cls._validate_dict(data), generated with `compile_validate_dict(cls, profiled=True)`"""
+        fn = cls.__dict__.get("_profiled_validate_dict")
+        if fn is None:
+            fn = cls._profiled_validate_dict = staticmethod(compile_validate_dict(cls, profiled=True))
+        fn = fn.__func__
+        start = perf_counter()
+        records = ()
+        try:
+            values, records = fn(cls, data, self)
+            return values, records
+        finally:
+            self.record("schema", cls.__name__, perf_counter() - start, bool(records))
+
+    def call_object(self, vobject, run, ob, max_errors=None, locale=None, fields=None):
+        """same as vobject(ob), validators are profiled"""
+        start = perf_counter()
+        failed = True
+        try:
+            result = run(vobject, ob, max_errors, locale, profiler=self, fields=fields)
+            failed = False
+            return result
+        finally:
+            self.record("object", vobject.__class__.__name__, perf_counter() - start, failed)
+
+    def call_validator(self, vobject, v, params):
+        start = perf_counter()
+        failed = True
+        try:
+            result = v(vobject, params)
+            failed = False
+            return result
+        finally:
+            name = getattr(v, "name", None) or _name_of(getattr(v, "method", v))
+            self.record("validator", "{}.{}".format(vobject.__class__.__name__, name), perf_counter() - start, failed)
+
+
+def enable(*sinks):
+    """activate a profiler with sinks, for all threads"""
+    profiler = _Profiling.profiler = Profiler(*sinks)
+    return profiler
+
+
+def disable():
+    _Profiling.profiler = None
+
+
+def get_profiler():
+    return _Profiling.profiler
+
+
+@contextmanager
+def profiling(*sinks):
+    previous = _Profiling.profiler
+    profiler = _Profiling.profiler = Profiler(*sinks)
+    try:
+        yield profiler
+    finally:
+        _Profiling.profiler = previous
@@ -0,0 +1,122 @@
+# -*- coding:utf-8 -*-
+"""
+streaming validation of a huge Collection field. items are validated while the json is read,
+and the results are passed to a sink. the list of items is never held in memory.
+
+.. code:: python
+
+    from tinyschema.streaming import validate_stream, JSONLinesSink
+
+    with open("dump.json", "rb") as rf, open("result.ndjson", "w") as wf:
+        result = validate_stream(Plot, "ps", rf, JSONLinesSink(wf))
+    print(result.count, result.failed)
+"""
+import logging
+logger = logging.getLogger(__name__)
+import json
+from . import (
+    _Collection,
+    _subschema_of,
+    Failure,
+    as_json_errors
+)
+from .parser import (
+    JSONArrayReader,
+    decode_ndjson,
+    DECODE_ERROR
+)
+
+
+def item_schema_of(schema, name):
+    sub = _subschema_of(getattr(schema, name))
+    if sub is None or sub[0] is not _Collection:
+        raise ValueError("{}.{} is not a Collection field".format(schema.__name__, name))
+    return sub[1]
+
+
+def iterate_items(item_schema, items, locale=None):
+    """yield (index, validated values or Failure) for each item (a dict, or a Failure of decoding)"""
+    validate_dict = item_schema._validate_dict
+    for i, item in enumerate(items):
+        if isinstance(item, Failure):  # undecodable line of ndjson
+            yield i, item
+            continue
+        if not isinstance(item, dict):
+            yield i, Failure(errors={DECODE_ERROR: ["object is expected"]})
+            continue
+        try:
+            values, records = validate_dict(item)
+        except Failure as e:  # from nested schema
+            yield i, e
+            continue
+        yield i, (Failure(records=records, locale=locale) if records else values)
+
+
+def iterate_stream(schema, name, source, locale=None, format="json", chunksize=65536):
+    """yield (index, validated values or Failure) for each item of the Collection field `name`.
+
+    format is "json" (source is an object for schema) or "ndjson" (each line of source is an item).
+    """
+    item_schema = item_schema_of(schema, name)
+    if format == "ndjson":
+        items = (item for _, item in decode_ndjson(source))
+    else:
+        items = JSONArrayReader(source, key=name, chunksize=chunksize)
+    return iterate_items(item_schema, items, locale=locale)
+
+
+class StreamResult(object):
+    """validated values of the other fields (None for ndjson), number of items and failed items"""
+    def __init__(self, values, count, failed):
+        self.values = values
+        self.count = count
+        self.failed = failed
+
+    def __repr__(self):
+        return "<StreamResult count={} failed={}>".format(self.count, self.failed)
+
+
+class JSONLinesSink(object):
+    """writes a line per item, {"index": i, "values": ...} or {"index": i, "errors": ...}"""
+    def __init__(self, fp, dumps=None):
+        self.fp = fp
+        self.dumps = dumps or (lambda ob: json.dumps(ob, default=str, ensure_ascii=False))
+
+    def __call__(self, index, result):
+        if isinstance(result, Failure):
+            line = self.dumps({"index": index, "errors": as_json_errors(result.errors)})
+        else:
+            line = self.dumps({"index": index, "values": result})
+        self.fp.write(line)
+        self.fp.write("\n")
+
+
+def validate_stream(schema, name, source, sink, locale=None, format="json", chunksize=65536):
+    """validate items of the Collection field `name` while reading source, `sink(index, values or Failure)`
+    is called for each item.
+
+    for "json" format, the other fields of schema are validated after the items (Failure is raised when invalid),
+    and returned as `values` of StreamResult.
+    """
+    item_schema = item_schema_of(schema, name)
+    if format == "ndjson":
+        reader = None
+        items = (item for _, item in decode_ndjson(source))
+    else:
+        reader = items = JSONArrayReader(source, key=name, chunksize=chunksize)
+
+    count = failed = 0
+    for index, result in iterate_items(item_schema, items, locale=locale):
+        count += 1
+        if isinstance(result, Failure):
+            failed += 1
+        sink(index, result)
+
+    if reader is None:
+        return StreamResult(None, count, failed)
+    data = reader.rest
+    if reader.found:
+        data[name] = []  # items are already validated
+    values = schema.validate_dict(data, locale=locale)
+    values.pop(name, None)
+    return StreamResult(values, count, failed)
@@ -0,0 +1,145 @@
+# -*- coding:utf-8 -*-
+import asyncio
+import pytest
+from .schemas import (
+    Point,
+    Plot
+)
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def test_avalidate__same_as_validate():
+    data = _run(Plot(ps=[{"x": "10", "y": "20"}]).avalidate())
+    assert data == Plot(ps=[{"x": "10", "y": "20"}]).validate()
+
+
+def test_avalidate__coroutine_convertor():
+    import tinyschema as t
+
+    async def exists(val, options):
+        await asyncio.sleep(0)
+        if val == "taken":
+            raise t.ValidationError(message="already exists")
+        return val
+
+    class S(t.Schema):
+        name = t.column(t.TextField, exists)
+        age = t.column(t.IntegerField)
+
+    assert _run(S(name="free", age="10").avalidate(concurrency=1)) == {"name": "free", "age": 10}
+    with pytest.raises(t.Failure) as e:
+        _run(S(name="taken", age="aa").avalidate())
+    assert e.value.errors == {"name": ["already exists"], "age": ["aa is not int"]}
+
+
+def test_avalidate__validation_object_with_coroutine_method():
+    from tinyschema import Failure
+    from tinyschema.datavalidation import ValidationObject, Invalid, multi, single, collection, share
+
+    class V(ValidationObject):
+        @multi(["x", "y"])
+        async def equals(self, x, y):
+            await asyncio.sleep(0)
+            if x != y:
+                raise Invalid("not equal")
+
+    class PlotValidation(ValidationObject):
+        @collection("ps")
+        class sub:
+            @share(single("x"), single("y"))
+            async def small(self, v):
+                if v > 10:
+                    raise Invalid("too large")
+
+    assert _run(V().avalidate(Point(x="1", y="1")))["x"] == 1
+    with pytest.raises(Failure) as e:
+        _run(V().avalidate(Point(x="1", y="2")))
+    assert e.value.errors == {"x": ["not equal"]}
+
+    with pytest.raises(Failure) as e:
+        _run(PlotValidation().avalidate(Plot(ps=[{"x": "1", "y": "1"}, {"x": "1", "y": "20"}])))
+    assert e.value.errors["ps"][1]["y"] == ["too large"]
+
+
+def test_avalidate__validation_object_same_options_as_call():
+    from tinyschema import Failure
+    from tinyschema.datavalidation import ValidationObject, Invalid, single, share
+    called = []
+
+    class SmallValidation(ValidationObject):
+        max_errors = 1
+
+        def configure(self, schema, max_errors=None, locale=None):
+            called.append("configure")
+            return super(SmallValidation, self).configure(schema, max_errors=max_errors, locale=locale)
+
+        @share(single("x"), single("y"))
+        def small(self, v):
+            called.append(v)
+            if v > 1:
+                raise Invalid("too large")
+
+    validate = SmallValidation()
+    for run in [lambda ob, **kw: validate(ob, **kw), lambda ob, **kw: _run(validate.avalidate(ob, **kw))]:
+        del called[:]
+        with pytest.raises(Failure) as e:
+            run(Point(x="10", y="20"), fields=["y"])
+        assert e.value.errors == {"y": ["too large"]}
+        assert called[0] == "configure"
+
+        with pytest.raises(Failure) as e:
+            run(Point(x="10", y="20"))
+        assert list(e.value.errors.keys()) == ["x"]
+
+
+def test_avalidate__incremental_validation_object():
+    from tinyschema import Failure
+    from tinyschema.datavalidation import ValidationObject, Invalid, multi
+    checked = []
+
+    class EqualValidation(ValidationObject):
+        incremental = True
+
+        @multi(["x", "y"])
+        async def equals(self, x, y):
+            checked.append((x, y))
+            if x != y:
+                raise Invalid("not equal")
+
+    validate = EqualValidation()
+    pt = Point(x="1", y="2")
+    for _ in range(2):
+        with pytest.raises(Failure) as e:
+            _run(validate.avalidate(pt))
+        assert e.value.errors == {"x": ["not equal"]}
+    assert checked == [(1, 2)]
+
+
+def test_avalidate__convert_is_a_barrier():
+    import tinyschema as t
+    from tinyschema.datavalidation import ValidationObject, Invalid, convert, single
+
+    class P(t.Schema):
+        a = t.column(t.IntegerField)
+        b = t.column(t.IntegerField)
+
+    class V(ValidationObject):
+        @single("b")
+        async def before(self, b):
+            await asyncio.sleep(0)
+            assert b == 2
+
+        @convert(["a"])
+        async def scale(self, params):
+            await asyncio.sleep(0)
+            params["a"] *= 10
+
+        @single("a")
+        def converted(self, a):
+            if a < 10:
+                raise Invalid("a must be converted first")
+
+    assert _run(V().avalidate(P(a=1, b=2))) == {"a": 10, "b": 2}
@@ -0,0 +1,94 @@
+# -*- coding:utf-8 -*-
+import pytest
+import tinyschema as t
+
+
+def _makeSchema(cache, **options):
+    calls = []
+
+    def counted(val, options):
+        calls.append(val)
+        return val
+
+    class S(t.Schema):
+        result_cache = cache
+        x = t.column(t.IntegerField, counted, **options)
+        y = t.column(t.IntegerField, required=False)
+    return S, calls
+
+
+def test_cache__hit_skips_convertors():
+    from tinyschema.cache import ResultCache
+    S, calls = _makeSchema(ResultCache())
+    assert S.validate_dict({"x": "1", "y": "2"}) == {"x": 1, "y": 2}
+    assert S.validate_dict({"y": "2", "x": "1"}) == {"x": 1, "y": 2}
+    assert S.validate_many([{"x": "1", "y": "2"}]) == [{"x": 1, "y": 2}]
+    assert calls == [1]
+    assert (S.result_cache.hits, S.result_cache.misses) == (2, 1)
+
+
+def test_cache__returned_values_are_copied():
+    from tinyschema.cache import ResultCache
+    S, _ = _makeSchema(ResultCache())
+    S.validate_dict({"x": "1"})["x"] = 100
+    assert S.validate_dict({"x": "1"}) == {"x": 1, "y": None}
+
+
+def test_cache__failure_is_cached_per_locale():
+    from tinyschema.cache import ResultCache
+    S, _ = _makeSchema(ResultCache())
+    for _ in range(2):
+        with pytest.raises(t.Failure) as e:
+            S.validate_dict({"x": "aa"})
+        assert e.value.errors == {"x": ["aa is not int"]}
+    with pytest.raises(t.Failure) as e:
+        S.validate_dict({"x": "aa"}, locale="ja")
+    assert e.value.errors == {"x": [u"aaは整数ではありません"]}
+    assert (S.result_cache.hits, S.result_cache.misses) == (1, 2)
+
+
+def test_cache__lru_and_ttl():
+    from tinyschema.cache import ResultCache
+    now = [0]
+    cache = ResultCache(maxsize=2, ttl=10, clock=lambda: now[0])
+    S, calls = _makeSchema(cache)
+    for x in ["1", "2", "1", "3", "1"]:  # 2 is evicted by 3
+        S.validate_dict({"x": x})
+    assert calls == [1, 2, 3]
+    S.validate_dict({"x": "2"})
+    assert calls == [1, 2, 3, 2]
+
+    now[0] = 100
+    S.validate_dict({"x": "2"})
+    assert calls == [1, 2, 3, 2, 2]
+    assert len(cache) == 2
+
+
+def test_cache__opt_out():
+    from tinyschema.cache import ResultCache
+    S, calls = _makeSchema(ResultCache(), cacheable=False)
+
+    class Parent(t.Schema):
+        result_cache = ResultCache()
+        s = t.column(t.Container(S))
+
+    assert not S._cacheable and not Parent._cacheable
+    for _ in range(2):
+        S.validate_dict({"x": "1"})
+        Parent.validate_dict({"s": {"x": "1"}})
+    assert len(calls) == 4
+    assert len(S.result_cache) == len(Parent.result_cache) == 0
+
+
+def test_cache__raw_body():
+    from tinyschema.cache import ResultCache, validate_body
+    S, calls = _makeSchema(ResultCache())
+    decoded = []
+
+    def loads(body):
+        decoded.append(body)
+        return {"x": "1"}
+
+    assert validate_body(S, b'{"x": "1"}', loads=loads) == {"x": 1, "y": None}
+    assert validate_body(S, memoryview(b'{"x": "1"}'), loads=loads) == {"x": 1, "y": None}
+    assert len(decoded) == len(calls) == 1
@@ -0,0 +1,47 @@
+# -*- coding:utf-8 -*-
+import pytest
+np = pytest.importorskip("numpy")
+
+
+def _callFUT(*args, **kwargs):
+    from tinyschema.columnar import validate_columns
+    return validate_columns(*args, **kwargs)
+
+
+def test_success():
+    from .schemas import Point
+    result = _callFUT(Point, {"x": ["10", "20"], "y": np.array([1, 2])})
+
+    assert result.columns["x"].tolist() == [10, 20]
+    assert result.columns["y"].tolist() == [1, 2]
+    assert result.columns["z"].tolist() == [None, None]
+    assert result.mask.tolist() == [False, False]
+    assert result.errors == {}
+
+
+def test_failure__messages_per_row():
+    from .schemas import Point
+    result = _callFUT(Point, {"x": ["10", "aa", "-1"], "y": [1, None, 3]})
+
+    assert result.failed.tolist() == [1, 2]
+    assert result.errors[1] == {"x": ["aa is not int"], "y": ["required"]}
+    assert result.errors[2] == {"x": ["-1 is smaller than zero"]}
+
+
+def test_range_and_fallback_convertor():
+    import tinyschema as t
+
+    class S(t.Schema):
+        v = t.column(t.FloatField, t.Range(0, 1))
+        c = t.column(t.TextField, t.OneOf(["a", "b"]))
+
+    result = _callFUT(S, {"v": [0.5, 2.0, 0.1], "c": ["a", "b", "x"]})
+    assert result.failed.tolist() == [1, 2]
+    assert list(result.errors[1].keys()) == ["v"]
+    assert list(result.errors[2].keys()) == ["c"]
+
+
+def test_length_mismatch():
+    from .schemas import Point
+    with pytest.raises(ValueError):
+        _callFUT(Point, {"x": [1, 2], "y": [1]})
@@ -155,3 +155,556 @@ def test_plot__validation2():
 
     with pytest.raises(Failure):
         plot.validate()
+
+
+def test_point__validate_dict():
+    params = {"x": "10", "y": "20", "foo": "foo"}
+    data = Point.validate_dict(params)
+
+    assert data == Point.fromdict(params.copy()).validate()
+    assert params == {"x": "10", "y": "20", "foo": "foo"}
+
+
+def test_point__validate_dict_failure():
+    from tinyschema import Failure
+
+    with pytest.raises(Failure) as e:
+        Point.validate_dict({"x": "-10"})
+    assert sorted(e.value.errors.keys()) == ["x", "y"]
+
+
+def test_pair__validate_dict():
+    params = {"l": {"x": "10", "y": "20"}, "r": {"x": "100", "y": "200"}}
+    data = Pair.validate_dict(params)
+
+    assert data["l"]["x"] == 10
+    assert data["r"]["y"] == 200
+
+
+def test_plot__validate_dict():
+    data = Plot.validate_dict({"ps": [{"x": "10", "y": "20"}, Point(x="1", y="2")]})
+
+    assert data["ps"][0]["x"] == 10
+    assert data["ps"][1]["x"] == 1
+
+
+def test_point__validate_many():
+    from tinyschema import Failure
+    rows = [{"x": "10", "y": "20"}, {"x": "aa", "y": "20"}, {"x": "1", "y": "2", "z": "3"}]
+    results = Point.validate_many(rows)
+
+    assert len(results) == 3
+    assert results[0]["x"] == 10
+    assert isinstance(results[1], Failure)
+    assert list(results[1].errors.keys()) == ["x"]
+    assert results[2]["z"] == 3
+
+
+def test_plot__validate_many__nested_failure():
+    from tinyschema import Failure
+    results = Plot.validate_many([{"ps": [{"x": "aa", "y": "20"}]}, {"ps": []}])
+
+    assert isinstance(results[0], Failure)
+    assert results[1] == {"ps": []}
+
+
+def test_plot__validate_many__malformed_nested_rows():
+    from tinyschema import Failure
+    good = {"ps": [{"x": "1", "y": "2"}]}
+    results = Plot.validate_many([good, {"ps": [1]}, {"ps": "ab"}, {"ps": {"x": "1"}}, good])
+
+    assert results[0] == results[4] == {"ps": [{"x": 1, "y": 2, "z": None}]}
+    for result in results[1:4]:
+        assert isinstance(result, Failure)
+        assert result.errors == {"ps": ["list of objects is expected"]}
+
+
+def test_pair__validate_many__malformed_nested_rows():
+    from tinyschema import Failure
+    results = Pair.validate_many([{"l": 1, "r": {"x": "1", "y": "2"}}, {"l": [], "r": "ab"}])
+
+    assert results[0].errors == {"l": ["object is expected"]}
+    assert isinstance(results[1], Failure)
+    assert results[1].errors == {"l": ["object is expected"], "r": ["object is expected"]}
+
+
+def test_pair__fields_are_created_at_first_access():
+    pair = Pair.fromdict({"l": {"x": "10", "y": "20"}, "r": {"x": "100", "y": "200"}})
+    assert "l" not in pair.__dict__
+
+    assert pair.l.x.value == "10"
+    assert "l" in pair.__dict__
+    assert "r" not in pair.__dict__
+
+
+def test_pair__column_access_from_class():
+    from tinyschema import PartialApplicationLike
+    assert isinstance(Pair.l, PartialApplicationLike)
+
+
+def test_point__validation_max_errors():
+    from tinyschema import Failure
+    with pytest.raises(Failure) as e:
+        Point(x="aa", y="bb").validate(max_errors=1)
+    assert list(e.value.errors.keys()) == ["x"]
+
+    with pytest.raises(Failure) as e:
+        Point(x="aa", y="bb").validate()
+    assert list(e.value.errors.keys()) == ["x", "y"]
+
+
+def test_pair__validation_max_errors__later_fields_are_not_created():
+    from tinyschema import Failure, as_schema, column, Container, PositiveIntegerField
+
+    @as_schema
+    class Wide(object):
+        x = column(PositiveIntegerField)
+        p = column(Container(Point))
+
+    wide = Wide.fromdict({"x": "aa", "p": {"x": "10", "y": "20"}})
+    with pytest.raises(Failure):
+        wide.validate(max_errors=1)
+    assert "p" not in wide.__dict__
+
+
+def test_point_validator__max_errors():
+    from tinyschema import Failure
+    from tinyschema.datavalidation import single, share, ValidationObject, Invalid
+
+    class SmallValidation(ValidationObject):
+        max_errors = 1
+
+        @share(single("x"), single("y"))
+        def small(self, v):
+            if v > 1:
+                raise Invalid("too large")
+
+    with pytest.raises(Failure) as e:
+        SmallValidation()(Point(x="10", y="20"))
+    assert list(e.value.errors.keys()) == ["x"]
+
+    with pytest.raises(Failure) as e:
+        SmallValidation()(Point(x="10", y="20"), max_errors=2)
+    assert sorted(e.value.errors.keys()) == ["x", "y"]
+
+
+def _makeIncremental():
+    from tinyschema import as_schema, column, IntegerField, Container, Collection
+    calls = []
+
+    def counted(val, options):
+        calls.append((options["name"], val))
+        return val
+
+    @as_schema
+    class Item(object):
+        incremental = True
+        v = column(IntegerField, counted)
+
+    @as_schema
+    class Wizard(object):
+        incremental = True
+        a = column(IntegerField, counted)
+        b = column(IntegerField, counted, required=False)
+        item = column(Container(Item))
+        items = column(Collection(Item))
+    return Wizard, calls
+
+
+def test_incremental__only_changed_fields_are_validated():
+    Wizard, calls = _makeIncremental()
+    wizard = Wizard.fromdict({"a": "1", "item": {"v": "2"}, "items": [{"v": "3"}, {"v": "4"}]})
+    expected = {"a": 1, "b": None, "item": {"v": 2}, "items": [{"v": 3}, {"v": 4}]}
+    assert wizard.validate() == expected
+    assert len(calls) == 4  # b is None
+
+    del calls[:]
+    assert wizard.validate() == expected
+    assert calls == []
+
+    wizard.b.renewal("10")
+    wizard.items[1].v.renewal("5")
+    assert wizard.validate()["items"] == [{"v": 3}, {"v": 5}]
+    assert calls == [("b", 10), ("v", 5)]
+    assert wizard.b.raw == "10"
+
+
+def test_incremental__bound_and_failed_fields_are_validated_again():
+    from tinyschema import Failure, OneOf, invalidate
+    Wizard, calls = _makeIncremental()
+    wizard = Wizard.fromdict({"a": "1", "item": {"v": "2"}, "items": []})
+    wizard.validate()
+
+    del calls[:]
+    wizard.a = wizard.a.bind(OneOf([2]))
+    with pytest.raises(Failure):
+        wizard.validate()
+    with pytest.raises(Failure):
+        wizard.validate()
+    assert calls == [("a", 1), ("a", 1)]
+
+    wizard.a.renewal("2")
+    wizard.validate()
+    wizard.a.label = "A"  # options are changed
+    wizard.validate()
+    invalidate(wizard.item.value)
+    wizard.validate()
+    assert calls[2:] == [("a", 2), ("a", 2), ("v", 2)]
+
+
+def test_incremental__validation_object_reuses_outcomes():
+    from tinyschema import Failure
+    from tinyschema.datavalidation import ValidationObject, Invalid, multi, single
+    Wizard, _ = _makeIncremental()
+    checked = []
+
+    class WizardValidation(ValidationObject):
+        incremental = True
+
+        @multi(["a", "b"])
+        def ordered(self, a, b):
+            checked.append("ordered")
+            if a > b:
+                raise Invalid("a > b")
+
+        @single("item")
+        def item(self, item):
+            checked.append("item")
+
+    validate = WizardValidation()
+    wizard = Wizard.fromdict({"a": "3", "b": "2", "item": {"v": "2"}, "items": []})
+    for _ in range(2):
+        with pytest.raises(Failure) as e:
+            validate(wizard)
+        assert e.value.errors == {"a": ["a > b"]}
+    assert checked == ["ordered", "item"]
+
+    wizard.b.renewal("5")
+    assert validate(wizard)["b"] == 5
+    assert checked == ["ordered", "item", "ordered"]
+
+
+def test_point_validator__field_index():
+    from tinyschema.datavalidation import single, multi, matched, convert, ValidationObject
+
+    class PointValidation(ValidationObject):
+        @single("x")
+        def positive(self, x):
+            pass
+
+        @multi(["x", "y"])
+        def ordered(self, x, y):
+            pass
+
+        @matched(["y", "z"])
+        def any_of(self, pairs):
+            pass
+
+        @convert()
+        def total(self, params):
+            pass
+
+    index = PointValidation.field_index
+    assert [v.method.__name__ for v in index["x"]] == ["positive", "ordered"]
+    assert [v.method.__name__ for v in index["y"]] == ["ordered", "any_of"]
+    assert [v.method.__name__ for v in index["z"]] == ["any_of"]
+
+
+def test_point_validator__only_given_fields():
+    from tinyschema import Failure
+    from tinyschema.datavalidation import single, multi, ValidationObject, Invalid
+    called = []
+
+    class PointValidation(ValidationObject):
+        @single("x")
+        def small_x(self, x):
+            called.append("x")
+            if x > 5:
+                raise Invalid("too large")
+
+        @single("y")
+        def small_y(self, y):
+            called.append("y")
+            if y > 5:
+                raise Invalid("too large")
+
+        @multi(["x", "z"])
+        def ordered(self, x, z):
+            called.append("xz")
+
+    pt = Point(x="1", y="20", z="3")
+    assert PointValidation()(pt, fields=["x"])["y"] == 20
+    assert called == ["x", "xz"]
+
+    del called[:]
+    with pytest.raises(Failure) as e:
+        PointValidation()(Point(x="1", y="20", z="3"), fields=("y", ))
+    assert e.value.errors == {"y": ["too large"]}
+    assert called == ["y"]
+
+
+def test_point_validator__params_changed_by_convert():
+    from tinyschema import Failure
+    from tinyschema.datavalidation import single, convert, ValidationObject, Invalid
+
+    class SumValidation(ValidationObject):
+        @convert(["x", "y"])
+        def total(self, params):
+            params["total"] = params["x"] + params["y"]
+            params["y"] = None
+
+        @single("total")
+        def small(self, total):
+            if total > 10:
+                raise Invalid("too large")
+
+        @single("y")
+        def unreachable(self, y):
+            raise Invalid("y is removed")
+
+    with pytest.raises(Failure) as e:
+        SumValidation()(Point(x="10", y="20"))
+    assert e.value.errors == {"total": ["too large"]}
+    assert SumValidation()(Point(x="1", y="2"))["total"] == 3
+
+
+def test_plot_validator__shared_between_threads():
+    import sys
+    from concurrent.futures import ThreadPoolExecutor
+    from tinyschema import Failure
+    from tinyschema.datavalidation import ValidationObject, Invalid, single, collection, share
+    from .schemas import Plot
+
+    class PlotValidation(ValidationObject):
+        @collection("ps")
+        class sub:
+            @share(single("x"), single("y"))
+            def small(self, v):
+                if v > 10:
+                    raise Invalid("too large")
+
+    validate = PlotValidation()
+
+    def run(i):
+        ps = [{"x": "1", "y": "1"} for _ in range(10)]
+        ps[i % 10] = {"x": "1", "y": "20"}
+        try:
+            validate(Plot(ps=ps))
+        except Failure as e:
+            return i, [j for j, d in enumerate(e.errors["ps"]) if d.get("y")]
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        with ThreadPoolExecutor(8) as executor:
+            results = list(executor.map(run, range(200)))
+    finally:
+        sys.setswitchinterval(interval)
+    assert all(found == [i % 10] for i, found in results)
+
+
+def test_counter__is_thread_safe():
+    from concurrent.futures import ThreadPoolExecutor
+    from tinyschema.datavalidation import Counter
+    counter = Counter()
+    with ThreadPoolExecutor(8) as executor:
+        values = list(executor.map(lambda _: counter(), range(1000)))
+    assert sorted(values) == list(range(1, 1001))
+
+
+def test_error_tree__sparse_collection_errors():
+    from tinyschema import ErrorTree, as_json_errors
+    errors = ErrorTree()
+    errors["x"].append("required")
+    errors.add(("ps", 99999, "y"), "too large")
+    errors.add(("ps", 2, "y"), "too large")
+    errors.add(("ps", 2, "z"), "required")
+
+    ps = errors["ps"]
+    assert len(ps) == 100000
+    assert ps.items() == [(2, {"y": ["too large"], "z": ["required"]}), (99999, {"y": ["too large"]})]
+    assert ps[-1]["y"] == ["too large"]
+    assert ps[0] == {}
+    assert len(ps._items) == 2
+
+    small = ErrorTree()
+    small.add(("ps", 1, "y"), "too large")
+    assert small == {"ps": [{}, {"y": ["too large"]}]}
+    assert as_json_errors(small) == {"ps": [{}, {"y": ["too large"]}]}
+
+
+def test_plot_validator__errors_of_many_items():
+    import json
+    import pickle
+    from tinyschema import Failure, as_json_errors
+    from tinyschema.datavalidation import ValidationObject, Invalid, single, collection, share
+    from .schemas import Plot
+
+    class PlotValidation(ValidationObject):
+        @collection("ps")
+        class sub:
+            @share(single("x"), single("y"))
+            def small(self, v):
+                if v > 10:
+                    raise Invalid("too large")
+
+    ps = [{"x": "1", "y": "1"} for _ in range(3)]
+    ps[2] = {"x": "1", "y": "20"}
+    with pytest.raises(Failure) as e:
+        PlotValidation()(Plot(ps=ps))
+    expected = {"ps": [{}, {}, {"y": ["too large"]}]}
+    assert e.value.errors == expected
+    assert json.loads(json.dumps(e.value.errors)) == expected
+    assert json.loads(json.dumps(as_json_errors(e.value.errors))) == expected
+    assert pickle.loads(pickle.dumps(e.value)).errors == expected
+
+
+def test_incremental__reused_failures_do_not_grow():
+    import traceback
+    from tinyschema import Failure
+    from tinyschema.datavalidation import ValidationObject, Invalid, multi
+    Wizard, _ = _makeIncremental()
+    depths = []
+
+    class WizardValidation(ValidationObject):
+        incremental = True
+
+        @multi(["a", "b"])
+        def ordered(self, a, b):
+            raise Invalid("a > b", position=["a"])
+
+        def catch_error(self, params, errors, validation, e):
+            depths.append(len(traceback.extract_tb(e.__traceback__)))
+            return super(WizardValidation, self).catch_error(params, errors, validation, e)
+
+    validate = WizardValidation()
+    wizard = Wizard.fromdict({"a": "3", "b": "2", "item": {"v": "2"}, "items": []})
+    for _ in range(50):
+        with pytest.raises(Failure) as e:
+            validate(wizard)
+        assert e.value.errors == {"a": ["a > b"]}
+    assert len(set(depths[1:])) == 1
+
+
+def test_schema__validation_is_compiled_at_first_call():
+    from tinyschema import as_schema, column, IntegerField
+
+    @as_schema
+    class Lazy(object):
+        x = column(IntegerField)
+
+    lazy_validate, lazy_validate_dict = Lazy.__dict__["_validate"], Lazy.__dict__["_validate_dict"]
+    assert Lazy(x="1").validate() == {"x": 1}
+    assert Lazy.validate_dict({"x": "2"}) == {"x": 2}
+    assert Lazy.__dict__["_validate"] is not lazy_validate
+    assert Lazy.__dict__["_validate_dict"] is not lazy_validate_dict
+    assert Lazy(x="3").validate() == {"x": 3}
+    assert Lazy.validate_dict({"x": "4"}) == {"x": 4}
+
+
+def test_pair_validator__overridden_exception():
+    from tinyschema import Failure
+    from tinyschema.datavalidation import ValidationObject, container, single
+
+    class PairValidation(ValidationObject):
+        Exception = ValueError
+
+        @container("l")
+        class sub:
+            @single("x")
+            def large(self, x):
+                if x < 100:
+                    raise ValueError("small")
+
+    with pytest.raises(Failure) as e:
+        PairValidation()(Pair(l={"x": "10", "y": "20"}, r={"x": "10", "y": "20"}))
+    assert e.value.errors == {"l": {"x": ["small"]}}
+
+
+def test_incremental__reused_failures_keep_exception_class():
+    from tinyschema import Failure
+    from tinyschema.datavalidation import ValidationObject, Invalid, multi, single
+    Wizard, _ = _makeIncremental()
+    raised = []
+
+    class Negative(Invalid):
+        pass
+
+    class WizardValidation(ValidationObject):
+        incremental = True
+        Exception = ValueError
+
+        @multi(["a", "b"])
+        def ordered(self, a, b):
+            raise ValueError("a > b")
+
+        def catch_error(self, params, errors, validation, e):
+            raised.append(e.__class__)
+            return super(WizardValidation, self).catch_error(params, errors, validation, e)
+
+    class InvalidValidation(ValidationObject):
+        incremental = True
+
+        @single("a")
+        def positive(self, a):
+            raise Negative("{} is negative".format(a), position=["b"])
+
+        def catch_error(self, params, errors, validation, e):
+            raised.append(e.__class__)
+            return super(InvalidValidation, self).catch_error(params, errors, validation, e)
+
+    wizard = Wizard.fromdict({"a": "3", "b": "2", "item": {"v": "2"}, "items": []})
+    for validate, expected in [(WizardValidation(), {"a": ["a > b"]}), (InvalidValidation(), {"b": ["3 is negative"]})]:
+        for _ in range(2):
+            with pytest.raises(Failure) as e:
+                validate(wizard)
+            assert e.value.errors == expected
+    assert raised == [ValueError, ValueError, Negative, Negative]
+
+
+def test_point_validator__configure_of_older_signature():
+    import asyncio
+    from collections import defaultdict
+    from tinyschema import Failure
+    from tinyschema.datavalidation import ValidationObject, Invalid, single
+
+    class OldValidation(ValidationObject):
+        def configure(self, schema):
+            return {"x": int(schema.x.value)}, defaultdict(list)
+
+        @single("x")
+        def small(self, x):
+            if x > 1:
+                raise Invalid("too large")
+
+    assert OldValidation()(Point(x="1")) == {"x": 1}
+    with pytest.raises(Failure) as e:
+        OldValidation()(Point(x="10"))
+    assert e.value.errors == {"x": ["too large"]}
+    assert asyncio.run(OldValidation().avalidate(Point(x="1"))) == {"x": 1}
+
+
+def test_point__copied_before_fields_are_created():
+    import copy
+    p = Point(x="1", y="2")
+    q = copy.copy(p)
+    assert p.validate() == {"x": 1, "y": 2, "z": None}
+    assert q.validate() == {"x": 1, "y": 2, "z": None}
+    assert q.x is not p.x
+
+
+def test_incremental__in_place_changes_are_validated():
+    from tinyschema import Failure, as_schema, column, ChoicesField
+
+    @as_schema
+    class Tags(object):
+        incremental = True
+        tags = column(ChoicesField)
+
+    form = Tags(tags=[("a", "A")])
+    assert form.validate() == {"tags": [("a", "A")]}
+    assert form.validate() == {"tags": [("a", "A")]}
+    form.tags.value.append(("bad", ))
+    with pytest.raises(Failure) as e:
+        form.validate()
+    assert list(e.value.errors) == ["tags"]
@@ -0,0 +1,84 @@
+# -*- coding:utf-8 -*-
+import pickle
+import pytest
+from .schemas import (
+    Point,
+    Pair
+)
+
+
+@pytest.mark.parametrize("ob", [
+    Point(x="10", y="20"),
+    Pair(l={"x": "10", "y": "20"}, r={"x": "10", "y": "20"}),
+])
+def test_schema_instance_is_picklable(ob):
+    restored = pickle.loads(pickle.dumps(ob))
+    assert restored.validate() == ob.validate()
+
+
+def test_failure_is_picklable():
+    from tinyschema import Failure
+    restored = pickle.loads(pickle.dumps(Failure(errors={"x": ["oops"]})))
+    assert restored.errors == {"x": ["oops"]}
+
+
+def test_validators_are_picklable():
+    import tinyschema as t
+    for v in [t.EMail(), t.URL, t.OneOf(["a"]), t.Range(0, 1)]:
+        pickle.loads(pickle.dumps(v))
+
+
+def test_validate_parallel__keeping_order():
+    from tinyschema import Failure
+    from tinyschema.parallel import validate_parallel
+    rows = [{"x": str(i), "y": "1"} if i % 3 else {"x": "aa"} for i in range(50)]
+    result = validate_parallel(Point, rows, workers=2, chunksize=7)
+
+    assert len(result) == 50
+    assert isinstance(result[0], Failure)
+    assert result[1]["x"] == 1
+    assert result[49]["x"] == 49
+
+
+def _makePlot(executor):
+    from tinyschema import as_schema, column, Collection
+    from tinyschema.parallel import CollectionExecutor
+
+    @as_schema
+    class BigPlot(object):
+        ps = column(Collection(Point), executor=CollectionExecutor(executor, shardsize=4))
+    return BigPlot
+
+
+def test_collection_executor__keeping_order_and_positions():
+    from concurrent.futures import ThreadPoolExecutor
+    from tinyschema import Failure
+    rows = [{"x": str(i), "y": "1"} for i in range(1, 20)]
+    with ThreadPoolExecutor(4) as executor:
+        BigPlot = _makePlot(executor)
+        data = BigPlot.validate_dict({"ps": rows})
+        assert [p["x"] for p in data["ps"]] == list(range(1, 20))
+
+        rows[5] = {"x": "aa", "y": "1"}
+        rows[17] = {"x": "1"}
+        with pytest.raises(Failure) as e:
+            BigPlot.validate_dict({"ps": rows})
+        assert [r.path for r in e.value.records] == [("ps", 5, "x"), ("ps", 17, "y")]
+        assert e.value.errors["ps"][5] == {"x": ["aa is not int"]}
+        assert e.value.errors["ps"][17] == {"y": ["required"]}
+
+        with pytest.raises(Failure) as e:
+            BigPlot.fromdict({"ps": rows}).validate()
+        assert sorted(e.value.errors["ps"][17].keys()) == ["y"]
+
+
+def test_collection_executor__process_pool():
+    from concurrent.futures import ProcessPoolExecutor
+    from tinyschema import Failure
+    rows = [{"x": str(i), "y": "1"} for i in range(1, 10)] + [{"x": "-1", "y": "1"}]
+    with ProcessPoolExecutor(2) as executor:
+        BigPlot = _makePlot(executor)
+        with pytest.raises(Failure) as e:
+            BigPlot.validate_dict({"ps": rows})
+    assert list(e.value.errors["ps"][9].keys()) == ["x"]
+    assert len(e.value.errors["ps"]) == 10
@@ -1,4 +1,5 @@
 # -*- coding:utf-8 -*-
+import pytest
 
 
 def _callFUT(*args, **kwargs):
@@ -65,3 +66,158 @@ def test_php_compatible_mdict_return_list():
     mdict = MultiDict([("name", "foo"), ("g_id[]", "1"), ("g_id[]", "2")])
     result = _callFUT(mdict)
     assert result == {"name": "foo", "g_id": ["1", "2"]}
+
+
+def test_ndjson__chunks_are_splitted_by_lines():
+    from tinyschema.parser import iterate_ndjson
+    chunks = [b'{"x": 1}\n{"x"', b': 2}\n\n', b'{"x": 3}']
+    result = list(iterate_ndjson(iter(chunks)))
+    assert result == [(1, {"x": 1}), (2, {"x": 2}), (4, {"x": 3})]
+
+
+def test_ndjson__validate_file_object():
+    import io
+    from tinyschema import Failure
+    from tinyschema.parser import validate_ndjson, DECODE_ERROR
+    from .schemas import Point
+
+    fp = io.BytesIO(b'{"x": "10", "y": "20"}\n{"x": "aa", "y": "20"}\n{broken\n[1, 2]\n')
+    result = list(validate_ndjson(Point, fp))
+
+    assert [line_no for line_no, _ in result] == [1, 2, 3, 4]
+    assert result[0][1]["x"] == 10
+    assert list(result[1][1].errors.keys()) == ["x"]
+    assert isinstance(result[2][1], Failure)
+    assert DECODE_ERROR in result[2][1].errors
+    assert DECODE_ERROR in result[3][1].errors
+
+
+def test_ndjson__malformed_nested_rows():
+    import io
+    from tinyschema.parser import validate_ndjson
+    from .schemas import Plot
+
+    fp = io.BytesIO(b'{"ps": [{"x": "1", "y": "2"}]}\n{"ps": "ab"}\n{"ps": [{"x": "1", "y": "2"}]}\n')
+    result = list(validate_ndjson(Plot, fp))
+
+    assert result[0][1] == result[2][1] == {"ps": [{"x": 1, "y": 2, "z": None}]}
+    assert result[1][1].errors == {"ps": ["list of objects is expected"]}
+
+
+def test_lists_mdict__return_dict():
+    class QueryDict(object):  # django/werkzeug like
+        def getlist(self, k):
+            raise AssertionError("lists() is used")
+
+        def lists(self):
+            return [("name", ["foo"]), ("tags[]", ["a", "b"])]
+
+    assert _callFUT(QueryDict()) == {"name": "foo", "tags": ["a", "b"]}
+
+
+def test_bracketed__nested_structure():
+    from webob.multidict import MultiDict
+    mdict = MultiDict([
+        ("name", "foo"),
+        ("points[1][x]", "10"), ("points[1][y]", "20"),
+        ("points[0][x]", "1"), ("points[0][y]", "2"),
+        ("tags[]", "a"), ("tags[]", "b"),
+        ("pair[l][x]", "3"),
+    ])
+    result = _callFUT(mdict)
+    assert result == {
+        "name": "foo",
+        "points": [{"x": "1", "y": "2"}, {"x": "10", "y": "20"}],
+        "tags": ["a", "b"],
+        "pair": {"l": {"x": "3"}},
+    }
+
+
+def test_bracketed__validated_by_collection():
+    from webob.multidict import MultiDict
+    from .schemas import Plot
+    mdict = MultiDict([("ps[0][x]", "1"), ("ps[0][y]", "2"), ("ps[5][x]", "3"), ("ps[5][y]", "4")])
+    result = Plot.validate_dict(_callFUT(mdict))
+    assert result == {"ps": [{"x": 1, "y": 2, "z": None}, {"x": 3, "y": 4, "z": None}]}
+
+
+
+def test_bracketed__indexes_of_holes():
+    from webob.multidict import MultiDict
+    mdict = MultiDict([("p[3][x]", "3"), ("p[1][x]", "1"), ("p[1][tags][2]", "a"), ("q[0]", "b")])
+    indexes = {}
+    assert _callFUT(mdict, indexes=indexes) == {"p": [{"x": "1", "tags": ["a"]}, {"x": "3"}], "q": ["b"]}
+    assert indexes == {("p", ): [1, 3], ("p", 0, "tags"): [2]}
+
+
+def test_bracketed__restore_indexes_of_errors():
+    from concurrent.futures import ThreadPoolExecutor
+    from webob.multidict import MultiDict
+    from tinyschema import Failure
+    from tinyschema.parser import restore_indexes
+    from .test_parallel import _makePlot
+    mdict = MultiDict([("ps[1][x]", "1"), ("ps[1][y]", "2"), ("ps[3][x]", "aa"), ("ps[3][y]", "4")])
+    indexes = {}
+    data = _callFUT(mdict, indexes=indexes)
+    with ThreadPoolExecutor(2) as executor:
+        with pytest.raises(Failure) as e:
+            _makePlot(executor).validate_dict(data)
+    assert [r.path for r in e.value.records] == [("ps", 1, "x")]
+
+    restored = restore_indexes(e.value, indexes)
+    assert [r.path for r in restored.records] == [("ps", 3, "x")]
+    assert restored.errors["ps"][3] == {"x": ["aa is not int"]}
+
+@pytest.mark.parametrize("items", [
+    [("name", "foo"), ("name", "bar"), ("g_id[]", "1")],  # mixed with repeated keys
+    [("a", "1"), ("a[x]", "2")],
+    [("a[x]", "1"), ("a[0]", "2")],
+    [("a[x]", "1"), ("a[x][y]", "2")],
+    [("a[b][c][d][e]", "1")],
+    [("a[100]", "1")],
+    [("a[][x]", "1")],
+])
+def test_bracketed__invalid(items):
+    from webob.multidict import MultiDict
+    from tinyschema.parser import MultiDictError
+    with pytest.raises(MultiDictError):
+        _callFUT(MultiDict(items), max_depth=3, max_index=10)
+
+
+def _decoders():
+    from tinyschema.parser import StdlibDecoder, OrjsonDecoder, orjson
+    yield StdlibDecoder()
+    if orjson is not None:
+        yield OrjsonDecoder()
+
+
+@pytest.mark.parametrize("data", [
+    '{"x": "10", "y": [1, 2]}',
+    b'{"x": "10", "y": [1, 2]}',
+    bytearray(b'{"x": "10", "y": [1, 2]}'),
+    memoryview(b'--{"x": "10", "y": [1, 2]}--')[2:-2],
+])
+def test_from_json__buffer_types(data):
+    from tinyschema.parser import from_json, set_decoder, get_decoder
+    original = get_decoder()
+    try:
+        for decoder in _decoders():
+            set_decoder(decoder)
+            assert from_json(data) == {"x": "10", "y": [1, 2]}
+    finally:
+        set_decoder(original)
+
+
+def test_from_json__undeclared_keys_are_dropped():
+    from tinyschema.parser import from_json, set_decoder, get_decoder
+    from .schemas import Pair
+    data = b'{"l": {"x": "1", "y": "2", "extra": [1]}, "r": {"x": "3", "y": "4"}, "csrf": "xxx"}'
+    original = get_decoder()
+    try:
+        for decoder in _decoders():
+            set_decoder(decoder)
+            result = from_json(data, schema=Pair)
+            assert result == {"l": {"x": "1", "y": "2"}, "r": {"x": "3", "y": "4"}}
+            assert Pair.validate_dict(result)["l"]["x"] == 1
+    finally:
+        set_decoder(original)
@@ -0,0 +1,114 @@
+# -*- coding:utf-8 -*-
+import pytest
+from .schemas import (
+    Point,
+    Pair
+)
+
+
+def _counts(sink):
+    return {k: (v.calls, v.failures) for k, v in sink.stats.items()}
+
+
+def test_profiling__schema_field_convertor():
+    from tinyschema import Failure
+    from tinyschema.profiling import profiling, MemorySink
+    sink = MemorySink()
+    with profiling(sink):
+        assert Point(x="10", y="20").validate() == {"x": 10, "y": 20, "z": None}
+        with pytest.raises(Failure) as e:
+            Point(x="aa", y="20").validate()
+    assert e.value.errors == {"x": ["aa is not int"]}
+
+    counts = _counts(sink)
+    assert counts[("schema", "Point")] == (2, 1)
+    assert counts[("field", "Point.x")] == (2, 1)
+    assert counts[("convertor", "Point.x:parse_int")] == (2, 1)
+    assert counts[("convertor", "Point.x:positive")] == (1, 0)
+    assert counts[("field", "Point.z")] == (2, 0)
+
+
+def test_profiling__same_result_as_usual():
+    from copy import deepcopy
+    from tinyschema.profiling import profiling, MemorySink
+
+    def run():
+        params = {"l": {"x": "10", "y": "20"}, "r": {"x": "1", "y": "2", "z": "3"}}
+        return Pair.validate_dict(deepcopy(params)), Pair(**deepcopy(params)).validate()
+
+    expected = run()
+    sink = MemorySink()
+    with profiling(sink):
+        assert run() == expected
+    assert sink.stats[("schema", "Pair")].calls == 2
+    assert sink.stats[("schema", "Point")].calls == 4
+
+
+def test_profiling__validation_object():
+    from tinyschema import Failure
+    from tinyschema.profiling import profiling, MemorySink
+    from tinyschema.datavalidation import ValidationObject, Invalid, multi
+
+    class PointValidation(ValidationObject):
+        @multi(["x", "y"])
+        def ordered(self, x, y):
+            if x > y:
+                raise Invalid("x > y")
+
+    sink = MemorySink()
+    with profiling(sink):
+        PointValidation()(Point(x="1", y="2"))
+        with pytest.raises(Failure):
+            PointValidation()(Point(x="3", y="2"))
+    counts = _counts(sink)
+    assert counts[("object", "PointValidation")] == (2, 1)
+    assert counts[("validator", "PointValidation.ordered")] == (2, 1)
+
+
+def test_profiling__callback_and_disabled():
+    from tinyschema.profiling import profiling, get_profiler
+    calls = []
+    with profiling(lambda *args: calls.append(args[:2])):
+        Point.validate_dict({"x": "1", "y": "2"})
+    assert ("schema", "Point") in calls
+    assert get_profiler() is None
+
+    del calls[:]
+    Point.validate_dict({"x": "1", "y": "2"})
+    assert calls == []
+
+
+def test_profiling__statsd():
+    import socket
+    from tinyschema.profiling import profiling, StatsdSink
+    listener = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    listener.bind(("127.0.0.1", 0))
+    listener.settimeout(5)
+    sink = StatsdSink(port=listener.getsockname()[1], prefix="app")
+    try:
+        with profiling(sink):
+            Point.validate_many([{"x": "aa", "y": "1"}])
+        received = []
+        while not any(line.startswith("app.schema.Point.") for line in received):
+            received.extend(listener.recv(65536).decode("ascii").split("\n"))
+    finally:
+        sink.close()
+        listener.close()
+    assert "app.field.Point.x.calls:1|c" in received
+    assert "app.field.Point.x.failures:1|c" in received
+    assert "app.convertor.Point.x_parse_int.failures:1|c" in received
+
+
+def test_profiling__validate_dict_same_errors_as_usual():
+    from tinyschema.profiling import profiling, MemorySink
+    rows = [{"l": "x", "r": None}, {"l": None}, {"l": {"x": "1", "y": "2"}, "r": [1]}]
+
+    def run():
+        results = [Pair._validate_dict(row) for row in rows]
+        return [(values, [(r.path, r.render()) for r in records]) for values, records in results]
+
+    expected = run()
+    sink = MemorySink()
+    with profiling(sink):
+        assert run() == expected
+    assert _counts(sink)[("schema", "Pair")] == (3, 3)
@@ -58,3 +58,75 @@ def test_schema_validation__failure():
     with pytest.raises(t.Failure) as e:
         s.validate()
     assert bool(e.value.errors) is True
+
+
+def test_schema_validation__after_bind__bound_convertors_are_used():
+    import tinyschema as t
+    s = _makeOne(x="10")
+    s.x = s.x.bind(t.OneOf([20, 30]))
+
+    with pytest.raises(t.Failure) as e:
+        s.validate()
+    assert list(e.value.errors.keys()) == ["x"]
+
+
+def test_schema_validation__default_is_used_when_not_required():
+    import tinyschema as t
+
+    class S(_getTarget()):
+        x = t.column(t.IntegerField, required=False, default=1)
+        y = t.column(t.IntegerField, required=False)
+
+    assert S().validate() == {"x": 1, "y": None}
+
+
+def test_schema_validation__inherited_schema_validates_own_fields():
+    import tinyschema as t
+
+    class S(_getTarget()):
+        x = t.column(t.IntegerField)
+
+    class S2(S):
+        y = t.column(t.IntegerField)
+
+    assert S2(x="1", y="2").validate() == {"x": 1, "y": 2}
+    with pytest.raises(t.Failure) as e:
+        S2(x="1").validate()
+    assert list(e.value.errors.keys()) == ["y"]
+
+
+def test_fields_share_options_until_modified():
+    s0 = _makeOne(x="10")
+    s1 = _makeOne(x="20")
+    s1.x.options["x"] = "zzz"
+
+    assert s0.x.x == "yyy"
+    assert s1.x.x == "zzz"
+
+
+def test_field_has_no_instance_dict():
+    s = _makeOne(x="10")
+    assert not hasattr(s.x, "__dict__")
+
+
+def test_field_setting_unknown_attribute__stored_as_option():
+    s0 = _makeOne(x="10")
+    s1 = _makeOne(x="20")
+    s1.x.choices = [("a", "a")]
+
+    assert s1.x.options["choices"] == [("a", "a")]
+    assert not hasattr(s0.x, "choices")
+
+
+def test_schema_validation__failure_keeps_records_until_rendered():
+    import tinyschema as t
+    s = _makeOne(x="aa")
+
+    with pytest.raises(t.Failure) as e:
+        s.validate()
+    assert e.value._errors is None
+    record = e.value.records[0]
+    assert record.path == ("x", )
+    assert record.code == "${val} is not int"
+    assert record.params == {"val": "aa"}
+    assert e.value.errors == {"x": ["aa is not int"]}
@@ -0,0 +1,107 @@
+# -*- coding:utf-8 -*-
+import io
+import pytest
+import tinyschema as t
+from .schemas import Point, Plot
+
+
+class Upload(t.Schema):
+    device = t.column(t.TextField)
+    points = t.column(t.Collection(Point))
+
+
+def test_validate_stream__json():
+    from tinyschema.streaming import validate_stream
+    source = io.BytesIO(b'{"device": "d1", "points": [{"x": "1", "y": "2"}, {"x": "aa", "y": "2"}, 1], "extra": {}}')
+    results = []
+    result = validate_stream(Upload, "points", source, lambda i, r: results.append((i, r)), chunksize=4)
+
+    assert (result.count, result.failed) == (3, 2)
+    assert result.values == {"device": "d1"}
+    assert results[0] == (0, {"x": 1, "y": 2, "z": None})
+    assert results[1][1].errors == {"x": ["aa is not int"]}
+    assert results[2][1].errors == {"__json__": ["object is expected"]}
+
+
+def test_validate_stream__other_fields_are_validated():
+    from tinyschema.streaming import validate_stream
+    with pytest.raises(t.Failure) as e:
+        validate_stream(Upload, "points", [b'{"points": []}'], lambda i, r: None)
+    assert e.value.errors == {"device": ["required"]}
+
+
+def test_iterate_stream__items_are_validated_lazily():
+    from tinyschema.streaming import iterate_stream
+
+    read = []
+
+    def chunks():
+        yield b'{"device": "d1", "points": ['
+        for i in range(1000):
+            read.append(i)
+            yield b'{"x": "1", "y": "2"},'
+        yield b'{"x": "1", "y": "2"}]}'
+
+    it = iterate_stream(Upload, "points", chunks())
+    assert next(it) == (0, {"x": 1, "y": 2, "z": None})
+    assert len(read) < 10
+    assert sum(1 for _ in it) == 1000
+
+
+def test_validate_stream__ndjson_to_jsonlines_sink():
+    import json
+    from tinyschema.streaming import validate_stream, JSONLinesSink
+    source = io.StringIO('{"x": "1", "y": "2"}\n{"x": "-1", "y": "2"}\n')
+    out = io.StringIO()
+    result = validate_stream(Upload, "points", source, JSONLinesSink(out), format="ndjson")
+    assert (result.values, result.count, result.failed) == (None, 2, 1)
+    lines = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert lines[0] == {"index": 0, "values": {"x": 1, "y": 2, "z": None}}
+    assert lines[1]["index"] == 1 and list(lines[1]["errors"]) == ["x"]
+
+
+def test_json_array_reader__chunk_boundaries():
+    import json
+    from tinyschema.parser import JSONArrayReader
+    doc = {"a": 1, "points": [{"x": i, "s": u"é" * (i % 3)} for i in range(50)] + [1.5e10, -2.5e-3, None], "b": [1]}
+    data = json.dumps(doc, ensure_ascii=False).encode("utf-8")
+    for size in (1, 2, 3, 7, 1024):
+        reader = JSONArrayReader([data[i:i + size] for i in range(0, len(data), size)], key="points")
+        assert list(reader) == doc["points"]
+        assert reader.rest == {"a": 1, "b": [1]}
+
+
+@pytest.mark.parametrize("data", [b'[1 2]', b'[1,]', b'[1', b''])
+def test_json_array_reader__invalid(data):
+    from tinyschema.parser import JSONArrayReader
+    with pytest.raises(ValueError):
+        list(JSONArrayReader([data]))
+
+
+def test_iterate_stream__malformed_nested_items():
+    from tinyschema.streaming import iterate_stream
+
+    @t.as_schema
+    class Batch(object):
+        plots = t.column(t.Collection(Plot))
+
+    source = [b'{"plots": [{"ps": [{"x": "1", "y": "2"}]}, {"ps": [1]}, {"ps": []}]}']
+    results = list(iterate_stream(Batch, "plots", source))
+
+    assert results[0] == (0, {"ps": [{"x": 1, "y": 2, "z": None}]})
+    assert results[1][1].errors == {"ps": ["list of objects is expected"]}
+    assert results[2] == (2, {"ps": []})
+
+
+def test_validate_stream__ndjson_malformed_lines():
+    from tinyschema.parser import DECODE_ERROR
+    from tinyschema.streaming import validate_stream
+    source = io.StringIO('{"x": "1", "y": "2"}\n{broken\n[1]\n{"x": "3", "y": "4"}\n')
+    results = []
+    result = validate_stream(Upload, "points", source, lambda i, r: results.append((i, r)), format="ndjson")
+
+    assert (result.count, result.failed) == (4, 2)
+    assert results[0] == (0, {"x": 1, "y": 2, "z": None})
+    assert list(results[1][1].errors) == [DECODE_ERROR]
+    assert results[2][1].errors == {DECODE_ERROR: ["object is expected"]}
+    assert results[3] == (3, {"x": 3, "y": 4, "z": None})
@@ -22,3 +22,62 @@ def test_positive():
     with pytest.raises(Failure) as e:
         S(value=-10).validate()
     assert "小さいです" in e.value.errors["value"][0]
+
+
+def test_locale_is_passed_explicitly():
+    from tinyschema import Failure, Schema, column, PositiveIntegerField
+    import pytest
+
+    class S(Schema):
+        value = column(PositiveIntegerField)
+
+    with pytest.raises(Failure) as e:
+        S(value=-10).validate(locale="en")
+    assert e.value.errors["value"] == ["-10 is smaller than zero"]
+    assert e.value.locale == "en"
+
+    with pytest.raises(Failure) as e:
+        S.validate_dict({"value": "-10"}, locale="ja")
+    assert "小さいです" in e.value.errors["value"][0]
+
+
+def test_locale__used_from_threads():
+    from concurrent.futures import ThreadPoolExecutor
+    from tinyschema import Schema, column, PositiveIntegerField
+
+    class S(Schema):
+        value = column(PositiveIntegerField)
+
+    def run(locale):
+        return S.validate_many([{"value": "-1"}], locale=locale)[0].errors["value"][0]
+
+    with ThreadPoolExecutor(4) as ex:
+        results = list(ex.map(run, ["ja", "en"] * 20))
+    assert all("小さいです" in r for r in results[::2])
+    assert all(r == "-1 is smaller than zero" for r in results[1::2])
+
+
+def test_rendered_messages_are_cached():
+    from tinyschema import _, render_message, _cached_render
+    render_message(_("${val} is not int", mapping={"val": "cached"}), "ja")
+    hits = _cached_render.cache_info().hits
+    result = render_message(_("${val} is not int", mapping={"val": "cached"}), "ja")
+
+    assert result == "cachedは整数ではありません"
+    assert _cached_render.cache_info().hits == hits + 1
+
+
+def test_rendered_messages_are_cached_per_value_type():
+    from tinyschema import _, render_message
+    results = [render_message(_("${val} is not int", mapping={"val": v}), "en") for v in [1, 1.0, True]]
+    assert results == ["1 is not int", "1.0 is not int", "True is not int"]
+
+
+def test_rendered_messages_with_large_values_are_not_cached():
+    from tinyschema import _, render_message, _cached_render
+    val = "1" * 100000
+    size = _cached_render.cache_info().currsize
+    result = render_message(_("${val} is not int", mapping={"val": val}), "ja")
+
+    assert result == val + "は整数ではありません"
+    assert _cached_render.cache_info().currsize == size
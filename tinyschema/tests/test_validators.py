@@ -0,0 +1,123 @@
+# -*- coding:utf-8 -*-
+import pytest
+
+
+def _render(e):
+    from tinyschema import ErrorRecord
+    return ErrorRecord.from_error(e).render()
+
+
+def test_one_of__failure():
+    from tinyschema import OneOf, ValidationError
+    with pytest.raises(ValidationError) as e:
+        OneOf([1, 2, 3])(4, {})
+    assert _render(e.value) == "4 is not in 1, 2, 3"
+
+
+def test_subset__failure():
+    from tinyschema import Subset, ValidationError
+    with pytest.raises(ValidationError) as e:
+        Subset(["a", "b"])(["a", "x"], {})
+    assert _render(e.value) == "a, x is not subset of  a, b"
+
+
+def test_any():
+    from tinyschema import Any, OneOf, ValidationError, parse_int
+    validate = Any([OneOf(["x"]), parse_int])
+    assert validate("x", {}) == "x"
+    assert validate("10", {}) == 10
+    with pytest.raises(ValidationError) as e:
+        validate("y", {})
+    assert _render(e.value) == "y is not validation suceeed."
+
+
+def test_email_and_url__messages():
+    from tinyschema import EMail, URL, ValidationError
+    with pytest.raises(ValidationError) as e:
+        EMail()("foo", {})
+    assert _render(e.value) == "invalid email foo"
+
+    with pytest.raises(ValidationError) as e:
+        URL("foo", {})
+    assert _render(e.value) == "foo is not url"
+
+
+def test_one_of__message_is_truncated():
+    from tinyschema import OneOf, ValidationError
+    with pytest.raises(ValidationError) as e:
+        OneOf(list(range(100)), limit=3)(-1, {})
+    assert _render(e.value) == "-1 is not in 0, 1, 2, ..."
+
+
+def test_one_of__shared_choice_index():
+    from tinyschema import OneOf, Subset, ChoiceIndex
+    index = ChoiceIndex(["jp", "us", "ch"])
+    assert OneOf(index).index is index
+    assert OneOf(index)("jp", {}) == "jp"
+    assert Subset(index)(["jp", "us"], {}) == ["jp", "us"]
+
+
+def test_one_of__unhashable_choices():
+    from tinyschema import OneOf
+    assert OneOf([[1, 2], [3]])([3], {}) == [3]
+
+
+def test_mapped_choice_index(tmpdir):
+    from tinyschema import OneOf, Subset, ValidationError, ChoiceIndex
+    path = tmpdir.join("skus.txt")
+    path.write("\n".join(sorted("sku{:05d}".format(i) for i in range(0, 1000, 3))) + "\n")
+    index = ChoiceIndex.from_file(str(path))
+
+    assert all("sku{:05d}".format(i) in index for i in range(0, 1000, 3))
+    assert not any("sku{:05d}".format(i) in index for i in range(1, 1000, 3))
+    assert "" not in index
+    assert Subset(index)(["sku00000", "sku00999"], {})
+    with pytest.raises(ValidationError) as e:
+        OneOf(index, limit=2)("x", {})
+    assert _render(e.value) == "x is not in sku00000, sku00003, ..."
+
+
+def test_url__no_catastrophic_backtracking():
+    from tinyschema import URL, ValidationError
+    # exponential with the nested quantifiers of the previous pattern
+    evil = "http://x" + "," * 64 + "("
+    assert URL(evil, {}) == evil
+    assert URL("https://example.com/a_(b)", {}) == "https://example.com/a_(b)"
+    with pytest.raises(ValidationError):
+        URL("(" * 64, {})
+
+
+def test_regex__prefilter():
+    from tinyschema import EMail, Regex, Prefilter, ValidationError
+    assert EMail()("foo@example.com", {}) == "foo@example.com"
+    with pytest.raises(ValidationError) as e:
+        EMail()("a" * 250 + "@example.com", {})
+    assert _render(e.value).startswith("invalid email aaa")
+
+    validate = Regex("^[a-z]+$", prefilter=Prefilter(prefixes=("x", "y")))
+    assert validate("xyz", {}) == "xyz"
+    with pytest.raises(ValidationError):
+        validate("abc", {})
+
+
+def test_regex__patterns_are_shared():
+    from tinyschema import EMail, Regex
+    assert EMail().rx is EMail().rx
+    assert Regex("^a$").rx is Regex("^a$").rx
+
+
+def test_regex__timeout():
+    import time
+    from tinyschema import Regex, ValidationError
+    from tinyschema import patterns
+    if patterns.regex is None:
+        with pytest.raises(RuntimeError):
+            Regex(r"^(a+)+$", timeout=0.1)
+        return
+
+    validate = Regex(r"^(a+)+$", timeout=0.1)
+    assert validate("aaa", {}) == "aaa"
+    start = time.perf_counter()
+    with pytest.raises(ValidationError):
+        validate("a" * 40 + "!", {})
+    assert time.perf_counter() - start < 2